@@ -0,0 +1,281 @@
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from time import monotonic
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from jsonschema import FormatChecker
+from qtpy import QtCore
+
+
+class PendingFormatCheck(Exception):
+    """Raised by a format check whose result is not known yet.
+
+    Validation errors caused by this exception mark the field as pending rather than invalid.
+    """
+
+
+def is_pending_error(err: Exception) -> bool:
+    return isinstance(getattr(err, "cause", None), PendingFormatCheck)
+
+
+class DaemonExecutor:
+    """Minimal thread pool executor with daemon workers.
+
+    Unlike ThreadPoolExecutor, a worker blocked on unresponsive storage does not prevent the interpreter
+    from exiting.
+    """
+
+    def __init__(self, max_workers: int):
+        self._queue = queue.Queue()
+        self._shutdown = False
+
+        for _ in range(max_workers):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def submit(self, func: Callable, *args) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot submit after shutdown")
+
+        future = Future()
+        self._queue.put((future, func, args))
+        return future
+
+    def shutdown(self, cancel_futures: bool = True):
+        self._shutdown = True
+
+        while cancel_futures:
+            try:
+                future, *_ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
+
+        self._queue.put(None)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                # Wake the next worker
+                self._queue.put(None)
+                return
+
+            future, func, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                future.set_result(func(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+
+class AsyncFormatChecker(QtCore.QObject):
+    """Run I/O-bound format checks (e.g. filesystem lookups) in a thread pool, off the GUI thread.
+
+    Results are fresh for cache_ttl seconds. After that they are stale, but are kept until a new result for the
+    value arrives, so that callers can keep showing them whilst the value is checked again. The cache holds the
+    max_cache_size most recently used results. Each requester only has one outstanding check per key; checks
+    which nobody is waiting on any more are cancelled if they have not started yet.
+    """
+
+    _resolved = QtCore.Signal(object, bool)
+
+    def __init__(self, checks: Dict[str, Callable[[str], bool]], max_workers: int = 4, cache_ttl: float = 5.0,
+                 max_cache_size: int = 1024, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self.checks = checks
+        self.cache_ttl = cache_ttl
+        self.max_cache_size = max_cache_size
+
+        self._executor = DaemonExecutor(max_workers)
+        self._cache: Dict[Tuple[str, str], Tuple[bool, float]] = OrderedDict()
+        self._futures: Dict[Tuple[str, str], Future] = {}
+        self._requests: Dict[Hashable, Tuple[Tuple[str, str], Callable[[bool], None]]] = {}
+
+        # Queued across threads, so results are always delivered on the GUI thread
+        self._resolved.connect(self._on_resolved)
+
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def lookup(self, format: str, value: str) -> Tuple[Optional[bool], bool]:
+        """Return the last result for a value (None if it has not been checked), and whether it is fresh"""
+        key = format, value
+        try:
+            result, timestamp = self._cache[key]
+        except KeyError:
+            return None, False
+
+        self._cache.move_to_end(key)
+        return result, monotonic() - timestamp <= self.cache_ttl
+
+    def request(self, requester: Hashable, format: str, value: str, callback: Callable[[bool], None]
+                ) -> Optional[bool]:
+        """Check a value on behalf of a requester.
+
+        If a fresh result is cached it is returned immediately, otherwise None is returned and callback(result)
+        is invoked on the GUI thread once the check resolves.
+        """
+        self.cancel(requester)
+
+        result, fresh = self.lookup(format, value)
+        if fresh:
+            return result
+
+        key = format, value
+        self._requests[requester] = (key, callback)
+
+        if key not in self._futures:
+            future = self._executor.submit(self.checks[format], value)
+            self._futures[key] = future
+            future.add_done_callback(partial(self._on_done, key))
+
+        return None
+
+    def cancel(self, requester: Hashable):
+        try:
+            key, _ = self._requests.pop(requester)
+        except KeyError:
+            return
+
+        # Drop the check itself if nobody else is waiting on it and it has not started yet
+        if any(k == key for k, _ in self._requests.values()):
+            return
+
+        future = self._futures.get(key)
+        if future is not None and future.cancel():
+            del self._futures[key]
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def shutdown(self):
+        self._requests.clear()
+        self._futures.clear()
+        self._executor.shutdown(cancel_futures=True)
+
+    def _prune_cache(self):
+        # Entries are kept in order of use, so the least recently used are at the front
+        cache = self._cache
+        while len(cache) > self.max_cache_size:
+            cache.popitem(last=False)
+
+    def _on_done(self, key: Tuple[str, str], future: Future):
+        # Called from the worker thread
+        if future.cancelled():
+            return
+
+        try:
+            result = bool(future.result())
+        except Exception:
+            result = False
+
+        self._resolved.emit(key, result)
+
+    def _on_resolved(self, key: Tuple[str, str], result: bool):
+        self._futures.pop(key, None)
+
+        self._cache.pop(key, None)
+        self._cache[key] = (result, monotonic())
+        self._prune_cache()
+
+        for requester, (request_key, callback) in [*self._requests.items()]:
+            if request_key == key:
+                del self._requests[requester]
+                callback(result)
+
+
+class AsyncFormatValidation(QtCore.QObject):
+    """Integrates an AsyncFormatChecker with whole-form validation.
+
+    Asynchronous formats are given non-blocking checks, which answer from the cache or raise
+    PendingFormatCheck. Values without a fresh result at the end of a validation pass are submitted once
+    editing pauses, and the form is revalidated when a result arrives that differs from the one shown. Stale
+    results are shown until then, rather than marking the field as pending again. Checks for values which are
+    no longer in the form are cancelled.
+    """
+
+    CHECK_DELAY_MS = 150
+
+    def __init__(self, checker: AsyncFormatChecker, revalidate: Callable[[], None], parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self.checker = checker
+        self.revalidate = revalidate
+
+        self._wanted: Set[Tuple[str, str]] = set()
+        self._requested: Set[Tuple[str, str]] = set()
+        self._shown: Dict[Tuple[str, str], bool] = {}
+
+        self._check_timer = QtCore.QTimer(self)
+        self._check_timer.setSingleShot(True)
+        self._check_timer.setInterval(self.CHECK_DELAY_MS)
+        self._check_timer.timeout.connect(self._submit)
+
+        self._revalidate_timer = QtCore.QTimer(self)
+        self._revalidate_timer.setSingleShot(True)
+        self._revalidate_timer.setInterval(0)
+        self._revalidate_timer.timeout.connect(self.revalidate)
+
+    def make_format_checker(self, format_checker: FormatChecker = None) -> FormatChecker:
+        """Return a format checker with the asynchronous formats replaced by non-blocking checks"""
+        checker = FormatChecker(formats=())
+        if format_checker is not None:
+            checker.checkers = {**format_checker.checkers}
+
+        for name in self.checker.checks:
+            checker.checkers[name] = (partial(self._check, name), PendingFormatCheck)
+        return checker
+
+    def begin(self):
+        """Start a validation pass"""
+        self._wanted = set()
+        self._shown = {}
+
+    def end(self):
+        """Finish a validation pass, cancelling checks for values which are no longer wanted"""
+        for key in self._requested - self._wanted:
+            self.checker.cancel((id(self), key))
+        self._requested &= self._wanted
+
+        if self._wanted - self._requested:
+            self._check_timer.start()
+
+    def cancel(self):
+        self._check_timer.stop()
+        for key in self._requested:
+            self.checker.cancel((id(self), key))
+        self._requested.clear()
+
+    def _check(self, format: str, value) -> bool:
+        if not isinstance(value, str):
+            return True
+
+        key = format, value
+        result, fresh = self.checker.lookup(*key)
+        if not fresh:
+            self._wanted.add(key)
+        if result is None:
+            raise PendingFormatCheck(f"Checking {value!r}")
+
+        self._shown[key] = result
+        return result
+
+    def _submit(self):
+        for key in self._wanted - self._requested:
+            result = self.checker.request((id(self), key), *key, partial(self._on_resolved, key))
+            if result is None:
+                self._requested.add(key)
+            else:
+                self._on_resolved(key, result)
+
+    def _on_resolved(self, key: Tuple[str, str], result: bool):
+        self._requested.discard(key)
+        if self._shown.get(key) != result:
+            self._revalidate_timer.start()
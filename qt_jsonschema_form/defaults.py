@@ -1,3 +1,6 @@
+from .utils import is_conditional_schema, iter_schema_branches
+
+
 def enum_defaults(schema):
     try:
         return schema["enum"][0]
@@ -25,7 +28,11 @@ def compute_defaults(schema):
     if "enum" in schema:
         return enum_defaults(schema)
 
-    schema_type = schema["type"]
+    # Conditional
+    if is_conditional_schema(schema):
+        return compute_defaults(next(iter_schema_branches(schema)))
+
+    schema_type = schema.get("type")
 
     if schema_type == "object":
         return object_defaults(schema)
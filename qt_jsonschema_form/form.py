@@ -1,8 +1,15 @@
-from copy import deepcopy
+from copy import copy, deepcopy
+from time import perf_counter
+from typing import Type
+from weakref import WeakSet
 
+from jsonschema import FormatChecker
 from jsonschema.validators import validator_for
 from . import widgets
+from .checks import AsyncFormatChecker, AsyncFormatValidation, is_pending_error
 from .defaults import compute_defaults
+from .metrics import FormMetrics
+from .utils import is_conditional_schema
 
 
 def get_widget_state(schema, state=None):
@@ -12,19 +19,25 @@ def get_widget_state(schema, state=None):
 
 
 def get_schema_type(schema: dict) -> str:
+    if is_conditional_schema(schema):
+        return "conditional"
     return schema['type']
 
 
 class WidgetBuilder:
     default_widget_map = {
         "boolean": {"checkbox": widgets.CheckboxSchemaWidget, "enum": widgets.EnumSchemaWidget},
-        "object": {"object": widgets.ObjectSchemaWidget, "enum": widgets.EnumSchemaWidget},
+        "object": {"object": widgets.ObjectSchemaWidget, "virtual": widgets.VirtualObjectSchemaWidget,
+                   "enum": widgets.EnumSchemaWidget},
         "number": {"spin": widgets.SpinDoubleSchemaWidget, "text": widgets.TextSchemaWidget, "enum": widgets.EnumSchemaWidget},
         "string": {"textarea": widgets.TextAreaSchemaWidget, "text": widgets.TextSchemaWidget, "password": widgets.PasswordWidget,
                    "filepath": widgets.FilepathSchemaWidget, "colour": widgets.ColorSchemaWidget, "enum": widgets.EnumSchemaWidget},
         "integer": {"spin": widgets.SpinSchemaWidget, "text": widgets.TextSchemaWidget, "range": widgets.IntegerRangeSchemaWidget,
                     "enum": widgets.EnumSchemaWidget},
-        "array": {"array": widgets.ArraySchemaWidget, "enum": widgets.EnumSchemaWidget}
+        "array": {"array": widgets.ArraySchemaWidget, "table": widgets.NumericArraySchemaWidget,
+                  "enum": widgets.EnumSchemaWidget},
+        "null": {"null": widgets.NullSchemaWidget},
+        "conditional": {"select": widgets.ConditionalSchemaWidget, "enum": widgets.EnumSchemaWidget}
     }
 
     default_widget_variants = {
@@ -34,41 +47,102 @@ class WidgetBuilder:
         "number": "spin",
         "integer": "spin",
         "string": "text",
+        "null": "null",
+        "conditional": "select",
     }
 
     widget_variant_modifiers = {
         "string": lambda schema: schema.get("format", "text")
     }
 
-    def __init__(self, validator_cls=None):
+    def __init__(self, validator_cls=None, format_checker: FormatChecker = None, async_format_checks: dict = None):
         self.widget_map = deepcopy(self.default_widget_map)
         self.validator_cls = validator_cls
+        self.format_checker = format_checker
+        self.metrics = None
 
-    def create_form(self, schema: dict, ui_schema: dict, state=None) -> widgets.SchemaWidgetMixin:
+        # Virtual object widgets of a form, which hold errors for rows that are not built yet
+        self.virtual_widgets = None
+
+        # I/O-bound format checks are run off the GUI thread, and shared between forms
+        self.async_format_checker = None
+        if async_format_checks:
+            self.async_format_checker = AsyncFormatChecker(async_format_checks)
+
+    def create_form(self, schema: dict, ui_schema: dict, state=None, metrics: bool = False
+                    ) -> widgets.SchemaWidgetMixin:
         validator_cls = self.validator_cls
         if validator_cls is None:
             validator_cls = validator_for(schema)
 
         validator_cls.check_schema(schema)
-        validator = validator_cls(schema)
-        schema_widget = self.create_widget(schema, ui_schema, state)
-        form = widgets.FormWidget(schema_widget)
+
+        # Widgets hold on to their builder, so give this form its own builder to record its widgets against
+        builder = copy(self)
+        builder.validator_cls = validator_cls
+        builder.virtual_widgets = WeakSet()
+
+        form_metrics = None
+        if metrics:
+            form_metrics = FormMetrics()
+            builder.metrics = form_metrics
+
+        schema_widget = builder.create_widget(schema, ui_schema, state)
+        form = widgets.FormWidget(schema_widget, form_metrics, builder.virtual_widgets)
+
+        format_checker = self.format_checker
+        async_validation = None
+        if self.async_format_checker is not None:
+            async_validation = AsyncFormatValidation(self.async_format_checker,
+                                                     lambda: validate(schema_widget.state), form)
+            format_checker = async_validation.make_format_checker(format_checker)
+            form.destroyed.connect(lambda *_: async_validation.cancel())
+
+        validator = validator_cls(schema, format_checker=format_checker)
+        pending_paths = set()
 
         def validate(data):
+            started = perf_counter()
             form.clear_errors()
+
+            if async_validation is not None:
+                async_validation.begin()
             errors = [*validator.iter_errors(data)]
+            if async_validation is not None:
+                async_validation.end()
+
+            # Pending asynchronous checks are shown on their fields, but are not errors
+            pending = [e for e in errors if is_pending_error(e)]
+            errors = [e for e in errors if not is_pending_error(e)]
 
             if errors:
                 form.display_errors(errors)
 
-            for err in errors:
+            for err in errors + pending:
                 schema_widget.handle_error(err.path, err)
 
+            # Clear fields whose checks have resolved since the last pass, if they still exist
+            error_paths = {tuple(e.path) for e in errors + pending}
+            for path in pending_paths - error_paths:
+                try:
+                    schema_widget.handle_error(path, None)
+                except (KeyError, IndexError):
+                    pass
+
+            pending_paths.clear()
+            pending_paths.update(tuple(e.path) for e in pending)
+
+            if form_metrics is not None:
+                form_metrics.record_validation(started)
+
         schema_widget.on_changed.connect(validate)
 
+        if form_metrics is not None:
+            form_metrics.reset_edit()
+
         return form
 
-    def create_widget(self, schema: dict, ui_schema: dict, state=None) -> widgets.SchemaWidgetMixin:
+    def get_widget_cls(self, schema: dict, ui_schema: dict) -> Type[widgets.SchemaWidgetMixin]:
         schema_type = get_schema_type(schema)
 
         try:
@@ -80,11 +154,26 @@ class WidgetBuilder:
             default_variant = "enum"
 
         widget_variant = ui_schema.get('ui:widget', default_variant)
-        widget_cls = self.widget_map[schema_type][widget_variant]
+        return self.widget_map[schema_type][widget_variant]
 
+    def can_create_widget(self, schema: dict, ui_schema: dict) -> bool:
+        try:
+            self.get_widget_cls(schema, ui_schema)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def create_widget(self, schema: dict, ui_schema: dict, state=None) -> widgets.SchemaWidgetMixin:
+        widget_cls = self.get_widget_cls(schema, ui_schema)
         widget = widget_cls(schema, ui_schema, self)
 
         default_state = get_widget_state(schema, state)
         if default_state is not None:
             widget.state = default_state
+
+        if self.virtual_widgets is not None and isinstance(widget, widgets.VirtualObjectSchemaWidget):
+            self.virtual_widgets.add(widget)
+
+        if self.metrics is not None:
+            self.metrics.watch(widget)
         return widget
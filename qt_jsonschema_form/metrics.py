@@ -0,0 +1,187 @@
+import json
+from bisect import bisect_left
+from collections import Counter, deque
+from functools import partial
+from time import perf_counter
+from typing import Dict, Optional
+
+from qtpy import QtCore, QtWidgets
+
+from . import widgets
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples, summarised into fixed millisecond buckets"""
+
+    BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self, window: int = 1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds * 1000)
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        samples = sorted(self.samples)
+
+        buckets = [0] * (len(self.BUCKETS_MS) + 1)
+        for sample in samples:
+            buckets[bisect_left(self.BUCKETS_MS, sample)] += 1
+
+        labels = [f"<={b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+
+        return {
+            "count": self.count,
+            "window": len(samples),
+            "p50_ms": _percentile(samples, 0.5),
+            "p95_ms": _percentile(samples, 0.95),
+            "max_ms": samples[-1] if samples else None,
+            "buckets": dict(zip(labels, buckets)),
+        }
+
+
+def _percentile(samples, fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class _WidgetRecord:
+    __slots__ = ("widget", "emissions", "window_index", "window_count", "previous_window_count")
+
+    def __init__(self, widget: widgets.SchemaWidgetMixin):
+        self.widget = widget
+        self.emissions = 0
+
+        # Emission counts for the current and previous fixed-length rate windows
+        self.window_index = 0
+        self.window_count = 0
+        self.previous_window_count = 0
+
+    def roll_window(self, index: int):
+        if index != self.window_index:
+            self.previous_window_count = self.window_count if index == self.window_index + 1 else 0
+            self.window_count = 0
+            self.window_index = index
+
+
+class FormMetrics:
+    """Counters and rolling latency histograms for a form.
+
+    Each schema widget created for the form is watched as it is built. Recording an emission or a validation
+    is O(1); paths and rates are only resolved when a snapshot is taken.
+    """
+
+    def __init__(self, rate_window: float = 5.0, latency_window: int = 1024):
+        self.rate_window = rate_window
+
+        self.edit_to_validated = LatencyHistogram(latency_window)
+        self.validation = LatencyHistogram(latency_window)
+        self.validations = 0
+        self.widget_counts = Counter()
+
+        self._records = {}
+        self._edit_started = None
+
+    def watch(self, widget: widgets.SchemaWidgetMixin):
+        key = id(widget)
+        record = self._records[key] = _WidgetRecord(widget)
+        self.widget_counts[type(widget).__name__] += 1
+
+        widget.on_changed.connect(partial(self._on_emitted, record))
+        widget.destroyed.connect(partial(self._forget, key, type(widget).__name__))
+
+    def _forget(self, key: int, class_name: str, *args):
+        if self._records.pop(key, None) is not None:
+            self.widget_counts[class_name] -= 1
+
+    def _on_emitted(self, record: _WidgetRecord, *args):
+        now = perf_counter()
+        record.emissions += 1
+
+        record.roll_window(int(now // self.rate_window))
+        record.window_count += 1
+
+        # The first emission after a validation is the edit which started the cascade. Emissions reach validation
+        # synchronously, so a start time that survives until the event loop runs belongs to an emission which
+        # never did (e.g. from a hidden conditional branch), and is discarded.
+        if self._edit_started is None:
+            self._edit_started = now
+            QtCore.QTimer.singleShot(0, partial(self._discard_edit, now))
+
+    def _discard_edit(self, started: float):
+        if self._edit_started == started:
+            self._edit_started = None
+
+    def reset_edit(self):
+        """Forget any emissions since the last validation, e.g. those made whilst building the form"""
+        self._edit_started = None
+
+    def record_validation(self, started: float):
+        now = perf_counter()
+        self.validations += 1
+        self.validation.record(now - started)
+
+        if self._edit_started is not None:
+            self.edit_to_validated.record(now - self._edit_started)
+            self._edit_started = None
+
+    def schema_path(self, widget: QtWidgets.QWidget, _names_cache: Dict[int, Dict[int, str]] = None) -> str:
+        names_cache = {} if _names_cache is None else _names_cache
+        path = []
+
+        child = widget
+        parent = widget.parentWidget()
+        while parent is not None:
+            if isinstance(parent, (widgets.ObjectSchemaWidget, widgets.VirtualObjectSchemaWidget)):
+                try:
+                    names = names_cache[id(parent)]
+                except KeyError:
+                    names = names_cache[id(parent)] = {id(w): n for n, w in parent.widgets.items()}
+                path.append(names.get(id(child), "?"))
+                child = parent
+
+            elif isinstance(parent, widgets.ArraySchemaWidget):
+                row = child.parentWidget()
+                path.append(row.index if isinstance(row, widgets.ArrayRowWidget) else "?")
+                child = parent
+
+            elif isinstance(parent, widgets.SchemaWidgetMixin):
+                child = parent
+
+            parent = parent.parentWidget()
+
+        return "." + ".".join(str(k) for k in reversed(path))
+
+    def snapshot(self) -> dict:
+        now = perf_counter()
+        names_cache = {}
+
+        fields = {}
+        for record in self._records.values():
+            path = self.schema_path(record.widget, names_cache)
+            # Sliding window estimate, weighting the previous window by its overlap with the trailing rate window
+            index, offset = divmod(now, self.rate_window)
+            record.roll_window(int(index))
+            overlap = 1 - offset / self.rate_window
+            recent = record.window_count + record.previous_window_count * overlap
+
+            field = fields.setdefault(path, {"emissions": 0, "emissions_per_second": 0.0, "subscribers": 0})
+            field["emissions"] += record.emissions
+            field["emissions_per_second"] += recent / self.rate_window
+            field["subscribers"] += len(record.widget.on_changed)
+
+        return {
+            "widgets": sum(self.widget_counts.values()),
+            "widget_counts": {k: v for k, v in self.widget_counts.items() if v},
+            "subscribers": sum(f["subscribers"] for f in fields.values()),
+            "validations": self.validations,
+            "validation": self.validation.snapshot(),
+            "edit_to_validated": self.edit_to_validated.snapshot(),
+            "fields": fields,
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
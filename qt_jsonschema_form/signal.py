@@ -1,3 +1,6 @@
+from contextlib import contextmanager
+
+
 class Signal:
     def __init__(self):
         self.cache = {}
@@ -16,10 +19,43 @@ class Signal:
 class BoundSignal:
     def __init__(self):
         self._subscribers = []
+        self._blocked = 0
+        self._pending = None
+
+    @property
+    def blocked(self) -> bool:
+        return self._blocked > 0
 
     def emit(self, *args):
+        if self._blocked:
+            self._pending = lambda: args
+            return
+
         for sub in self._subscribers:
             sub(*args)
 
+    def emit_lazy(self, get_args):
+        """Emit the arguments returned by get_args, which is only invoked once the signal is unblocked"""
+        if self._blocked:
+            self._pending = get_args
+            return
+
+        self.emit(*get_args())
+
     def connect(self, listener):
         self._subscribers.append(listener)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    @contextmanager
+    def coalesced(self):
+        """Hold back emissions until the outermost block exits, then emit the most recent one"""
+        self._blocked += 1
+        try:
+            yield self
+        finally:
+            self._blocked -= 1
+            if not self._blocked and self._pending is not None:
+                get_args, self._pending = self._pending, None
+                self.emit(*get_args())
@@ -1,8 +1,13 @@
+import math
+import sys
+from contextlib import contextmanager, ExitStack
 from functools import wraps
-from typing import Iterator
+from typing import Iterator, Optional, Tuple
 
 from qtpy import QtWidgets
 
+from .signal import BoundSignal
+
 
 class StateProperty(property):
 
@@ -35,9 +40,184 @@ def is_concrete_schema(schema: dict) -> bool:
     return "type" in schema
 
 
+def numeric_bounds(schema: dict) -> Tuple[Optional[float], bool, Optional[float], bool]:
+    """Return (minimum, exclusive, maximum, exclusive) for a number / integer schema.
+
+    Supports both the boolean (draft 4) and numeric (draft 6+) forms of exclusiveMinimum / exclusiveMaximum.
+    """
+    minimum = schema.get("minimum")
+    exclusive_minimum = schema.get("exclusiveMinimum", False)
+    if not isinstance(exclusive_minimum, bool):
+        minimum, exclusive_minimum = exclusive_minimum, True
+
+    maximum = schema.get("maximum")
+    exclusive_maximum = schema.get("exclusiveMaximum", False)
+    if not isinstance(exclusive_maximum, bool):
+        maximum, exclusive_maximum = exclusive_maximum, True
+
+    return minimum, exclusive_minimum, maximum, exclusive_maximum
+
+
+def is_valid_number(schema: dict, value: float) -> bool:
+    minimum, exclusive_minimum, maximum, exclusive_maximum = numeric_bounds(schema)
+
+    if minimum is not None and (value < minimum or exclusive_minimum and value == minimum):
+        return False
+
+    if maximum is not None and (value > maximum or exclusive_maximum and value == maximum):
+        return False
+
+    if "multipleOf" in schema:
+        multiple = schema["multipleOf"]
+        quotient = value / multiple
+        if abs(round(quotient) - quotient) > 1e-9:
+            return False
+
+    return True
+
+
+def first_valid_number(schema: dict, max_steps: int = 1000) -> Optional[float]:
+    """Return the valid number / integer closest to zero, or None if none is found"""
+    minimum, exclusive_minimum, maximum, exclusive_maximum = numeric_bounds(schema)
+    is_integer = schema.get("type") == "integer"
+
+    def is_valid(value) -> bool:
+        if is_integer and not float(value).is_integer():
+            return False
+        return is_valid_number(schema, value)
+
+    cast = int if is_integer else float
+    if is_valid(0):
+        return cast(0)
+
+    step = schema.get("multipleOf", 1 if is_integer else None)
+
+    # Search upwards from the minimum, unless zero is too large
+    below_minimum = minimum is not None and (minimum > 0 or minimum == 0 and exclusive_minimum)
+
+    if step is None:
+        epsilon = sys.float_info.epsilon
+        if below_minimum:
+            candidates = [minimum, minimum + max(abs(minimum), 1.0) * epsilon]
+        elif maximum is not None:
+            candidates = [maximum, maximum - max(abs(maximum), 1.0) * epsilon]
+        else:
+            candidates = []
+    elif below_minimum:
+        first = math.ceil(minimum / step)
+        candidates = ((first + i) * step for i in range(max_steps))
+    elif maximum is not None:
+        first = math.floor(maximum / step)
+        candidates = ((first - i) * step for i in range(max_steps))
+    else:
+        candidates = []
+
+    for candidate in candidates:
+        if is_valid(candidate):
+            return cast(candidate)
+
+    return None
+
+
 def iter_layout_items(layout) -> Iterator[QtWidgets.QLayoutItem]:
     return (layout.itemAt(i) for i in range(layout.count()))
 
 
 def iter_layout_widgets(layout: QtWidgets.QLayout) -> Iterator[QtWidgets.QWidget]:
     return (i.widget() for i in iter_layout_items(layout))
+
+
+@contextmanager
+def suspended_updates(widget: QtWidgets.QWidget):
+    """Suspend repaints and layout activation for a widget subtree, then apply them in a single pass"""
+    updates_enabled = widget.updatesEnabled()
+    widget.setUpdatesEnabled(False)
+
+    # Layouts that are already disabled belong to an enclosing suspension
+    layouts = [l for l in widget.findChildren(QtWidgets.QLayout) if l.isEnabled()]
+    for layout in layouts:
+        layout.setEnabled(False)
+
+    try:
+        yield
+    finally:
+        for layout in layouts:
+            layout.setEnabled(True)
+            layout.invalidate()
+
+        if widget.layout() is not None and widget.layout().isEnabled():
+            widget.layout().activate()
+
+        widget.setUpdatesEnabled(updates_enabled)
+
+
+@contextmanager
+def coalesced_signals(widget: QtWidgets.QWidget):
+    """Coalesce the on_changed emissions of a schema widget and its descendants.
+
+    Signals are released in reverse tree order, so that each widget emits once after its descendants.
+    """
+    with ExitStack() as stack:
+        for child in [widget, *widget.findChildren(QtWidgets.QWidget)]:
+            signal = getattr(child, "on_changed", None)
+            if isinstance(signal, BoundSignal):
+                stack.enter_context(signal.coalesced())
+        yield
+
+
+CONDITIONAL_KEYWORDS = ("oneOf", "anyOf", "if", "then", "else")
+
+
+def is_conditional_schema(schema: dict) -> bool:
+    return "oneOf" in schema or "anyOf" in schema or "if" in schema
+
+
+def json_type_of(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    raise TypeError(value)
+
+
+def merge_schemas(base: dict, schema: dict) -> dict:
+    """Merge a subschema into a base schema, combining object properties"""
+    merged = {**base, **schema}
+
+    if "properties" in base or "properties" in schema:
+        base_properties = base.get("properties", {})
+        properties = schema.get("properties", {})
+        merged["properties"] = {n: merge_schemas(base_properties.get(n, {}), properties.get(n, {}))
+                                for n in {**base_properties, **properties}}
+
+    if "required" in base and "required" in schema:
+        merged["required"] = [*base["required"], *(n for n in schema["required"] if n not in base["required"])]
+
+    # A constant is a single-valued enum
+    if "const" in merged:
+        merged["enum"] = [merged["const"]]
+        merged.setdefault("type", json_type_of(merged["const"]))
+
+    return merged
+
+
+def iter_schema_branches(schema: dict) -> Iterator[dict]:
+    """Yield the concrete schema of each branch of a oneOf / anyOf / if-then-else schema"""
+    base = {k: v for k, v in schema.items() if k not in CONDITIONAL_KEYWORDS}
+
+    if "oneOf" in schema or "anyOf" in schema:
+        for sub_schema in schema.get("oneOf", schema.get("anyOf")):
+            yield merge_schemas(base, sub_schema)
+    else:
+        yield merge_schemas(merge_schemas(base, schema["if"]), schema.get("then", {}))
+        yield merge_schemas(base, schema.get("else", {}))
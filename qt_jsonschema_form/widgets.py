@@ -1,11 +1,28 @@
+import array
+import math
+import operator
+import sys
+from bisect import bisect_right
+from contextlib import contextmanager
 from functools import partial
-from typing import List
+from itertools import accumulate
+from operator import attrgetter
+from typing import Iterable, List
 from typing import Tuple, Optional, Dict
 
+from jsonschema.validators import validator_for
 from qtpy import QtWidgets, QtCore, QtGui
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .checks import is_pending_error
+from .defaults import compute_defaults
 from .signal import Signal
-from .utils import iter_layout_widgets, state_property, is_concrete_schema
+from .utils import state_property, is_concrete_schema, suspended_updates, coalesced_signals, iter_schema_branches, \
+    json_type_of, numeric_bounds, is_valid_number, first_valid_number, is_conditional_schema
 
 
 class SchemaWidgetMixin:
@@ -13,6 +30,10 @@ class SchemaWidgetMixin:
 
     VALID_COLOUR = '#ffffff'
     INVALID_COLOUR = '#f6989d'
+    PENDING_COLOUR = '#fff3b0'
+
+    # Whether an asynchronous format check is outstanding for this field
+    pending = False
 
     def __init__(self, schema: dict, ui_schema: dict, widget_builder: 'WidgetBuilder', **kwargs):
         super().__init__(**kwargs)
@@ -43,14 +64,42 @@ class SchemaWidgetMixin:
     def clear_error(self):
         self._set_valid_state(None)
 
+    def emit_state(self):
+        # Defer computing the state whilst emissions are being coalesced
+        self.on_changed.emit_lazy(lambda: (self.state,))
+
     def _set_valid_state(self, error: Exception = None):
+        self.pending = error is not None and is_pending_error(error)
+        if self.pending:
+            self._set_background_colour(self.PENDING_COLOUR)
+            self.setToolTip("Checking…")
+            return
+
+        self._set_background_colour(self.VALID_COLOUR if error is None else self.INVALID_COLOUR)
+        self.setToolTip("" if error is None else error.message)  # TODO
+
+    def _set_background_colour(self, name: str):
         palette = self.palette()
         colour = QtGui.QColor()
-        colour.setNamedColor(self.VALID_COLOUR if error is None else self.INVALID_COLOUR)
+        colour.setNamedColor(name)
         palette.setColor(self.backgroundRole(), colour)
 
         self.setPalette(palette)
-        self.setToolTip("" if error is None else error.message)  # TODO
+
+
+class NullSchemaWidget(SchemaWidgetMixin, QtWidgets.QLabel):
+
+    @state_property
+    def state(self) -> None:
+        return None
+
+    @state.setter
+    def state(self, state: None):
+        pass
+
+    def configure(self):
+        self.setText("null")
+        self.setAutoFillBackground(True)
 
 
 class TextSchemaWidget(SchemaWidgetMixin, QtWidgets.QLineEdit):
@@ -86,7 +135,7 @@ class TextAreaSchemaWidget(SchemaWidgetMixin, QtWidgets.QTextEdit):
         self.setPlainText(state)
 
     def configure(self):
-        self.textChanged.connect(lambda: self.on_changed.emit(self.state))
+        self.textChanged.connect(lambda: self.emit_state())
 
 
 class CheckboxSchemaWidget(SchemaWidgetMixin, QtWidgets.QCheckBox):
@@ -100,7 +149,7 @@ class CheckboxSchemaWidget(SchemaWidgetMixin, QtWidgets.QCheckBox):
         self.setChecked(checked)
 
     def configure(self):
-        self.stateChanged.connect(lambda _: self.on_changed.emit(self.state))
+        self.stateChanged.connect(lambda _: self.emit_state())
 
 
 class SpinDoubleSchemaWidget(SchemaWidgetMixin, QtWidgets.QDoubleSpinBox):
@@ -213,7 +262,7 @@ class ColorSchemaWidget(SchemaWidgetMixin, QColorButton):
     """Widget representation of a string with the 'color' format keyword."""
 
     def configure(self):
-        self.colorChanged.connect(lambda: self.on_changed.emit(self.state))
+        self.colorChanged.connect(lambda: self.emit_state())
 
     @state_property
     def state(self) -> str:
@@ -253,6 +302,39 @@ class FilepathSchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
         self.path_widget.setText(state)
 
 
+class ArrayDragHandle(QtWidgets.QLabel):
+    """Grip used to select array rows and to drag them to a new position."""
+
+    on_clicked = QtCore.Signal(bool)
+    on_drag = QtCore.Signal()
+
+    def __init__(self):
+        super().__init__("≡")
+
+        self.setCursor(QtCore.Qt.OpenHandCursor)
+        self._press_pos = None
+
+    def mousePressEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton:
+            self._press_pos = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._press_pos is not None:
+            distance = (event.pos() - self._press_pos).manhattanLength()
+            if distance >= QtWidgets.QApplication.startDragDistance():
+                self._press_pos = None
+                self.on_drag.emit()
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._press_pos is not None:
+            self._press_pos = None
+            extend = bool(event.modifiers() & (QtCore.Qt.ControlModifier | QtCore.Qt.ShiftModifier))
+            self.on_clicked.emit(extend)
+        super().mouseReleaseEvent(event)
+
+
 class ArrayControlsWidget(QtWidgets.QWidget):
     on_delete = QtCore.Signal()
     on_move_up = QtCore.Signal()
@@ -263,6 +345,8 @@ class ArrayControlsWidget(QtWidgets.QWidget):
 
         style = self.style()
 
+        self.drag_handle = ArrayDragHandle()
+
         self.up_button = QtWidgets.QPushButton()
         self.up_button.setIcon(style.standardIcon(QtWidgets.QStyle.SP_ArrowUp))
         self.up_button.clicked.connect(lambda _: self.on_move_up.emit())
@@ -277,6 +361,7 @@ class ArrayControlsWidget(QtWidgets.QWidget):
 
         group_layout = QtWidgets.QHBoxLayout()
         self.setLayout(group_layout)
+        group_layout.addWidget(self.drag_handle)
         group_layout.addWidget(self.up_button)
         group_layout.addWidget(self.down_button)
         group_layout.addWidget(self.delete_button)
@@ -286,7 +371,7 @@ class ArrayControlsWidget(QtWidgets.QWidget):
 
 class ArrayRowWidget(QtWidgets.QWidget):
 
-    def __init__(self, widget: QtWidgets.QWidget, controls: ArrayControlsWidget):
+    def __init__(self, widget: QtWidgets.QWidget, controls: ArrayControlsWidget, index: int, schema_token: int):
         super().__init__()
 
         layout = QtWidgets.QHBoxLayout()
@@ -297,67 +382,99 @@ class ArrayRowWidget(QtWidgets.QWidget):
         self.widget = widget
         self.controls = controls
 
+        # Position within the parent array, and a token shared by rows with equal item schemas
+        self.index = index
+        self.schema_token = schema_token
+
+        self.selected = False
+
+    def set_selected(self, selected: bool):
+        self.selected = selected
+        self.setAutoFillBackground(selected)
+        self.setBackgroundRole(QtGui.QPalette.Highlight if selected else QtGui.QPalette.Window)
+
 
 class ArraySchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
+    ROW_MIME_TYPE = "application/x-qt-jsonschema-form-array-rows"
 
     @property
     def rows(self) -> List[ArrayRowWidget]:
-        return [*iter_layout_widgets(self.array_layout)]
+        return [*self._rows]
+
+    @property
+    def selected_rows(self) -> List[ArrayRowWidget]:
+        return sorted(self._selected_rows, key=attrgetter("index"))
 
     @state_property
     def state(self) -> list:
-        return [r.widget.state for r in self.rows]
+        return [r.widget.state for r in self._rows]
 
     @state.setter
     def state(self, state: list):
-        for row in self.rows:
-            self._remove_item(row)
+        with suspended_updates(self):
+            for row in self._rows:
+                self._remove_item(row)
+            self._rows.clear()
+            self._selected_rows.clear()
+
+            for item in state:
+                self._add_item(item)
 
-        for item in state:
-            self._add_item(item)
+            self._refresh_controls()
 
-        self.on_changed.emit(self.state)
+        self.emit_state()
 
     def handle_error(self, path: Tuple[str], err: Exception):
         index, *tail = path
-        self.rows[index].widget.handle_error(tail, err)
+        self._rows[index].widget.handle_error(tail, err)
 
     def configure(self):
         layout = QtWidgets.QVBoxLayout()
         style = self.style()
 
+        self._rows = []
+        self._selected_rows = set()
+        self._schema_tokens = []
+        self._dragged_rows = None
+
         self.add_button = QtWidgets.QPushButton()
         self.add_button.setIcon(style.standardIcon(QtWidgets.QStyle.SP_FileIcon))
         self.add_button.clicked.connect(lambda _: self.add_item())
 
         self.array_layout = QtWidgets.QVBoxLayout()
-        array_widget = QtWidgets.QWidget(self)
-        array_widget.setLayout(self.array_layout)
+        self.array_widget = QtWidgets.QWidget(self)
+        self.array_widget.setLayout(self.array_layout)
 
-        self.on_changed.connect(self._on_updated)
+        self.setAcceptDrops(True)
+        self.setFocusPolicy(QtCore.Qt.ClickFocus)
 
         layout.addWidget(self.add_button)
-        layout.addWidget(array_widget)
+        layout.addWidget(self.array_widget)
         self.setLayout(layout)
 
-    def _on_updated(self, state):
-        # Update add button
-        disabled = self.next_item_schema is None
-        self.add_button.setEnabled(not disabled)
-
-        previous_row = None
-        for i, row in enumerate(self.rows):
-            if previous_row:
-                can_exchange_previous = previous_row.widget.schema == row.widget.schema
-                row.controls.up_button.setEnabled(can_exchange_previous)
-                previous_row.controls.down_button.setEnabled(can_exchange_previous)
-            else:
-                row.controls.up_button.setEnabled(False)
-            row.controls.delete_button.setEnabled(not self.is_fixed_schema(i))
-            previous_row = row
+        self._refresh_controls()
+
+    def _refresh_controls(self, start: int = 0, stop: int = None):
+        """Update the control buttons of the rows in [start, stop)"""
+        self.add_button.setEnabled(self.next_item_schema is not None)
+
+        rows = self._rows
+        stop = len(rows) if stop is None else min(stop, len(rows))
+
+        for i in range(max(0, start), stop):
+            row = rows[i]
+            controls = row.controls
+            controls.up_button.setEnabled(i > 0 and rows[i - 1].schema_token == row.schema_token)
+            controls.down_button.setEnabled(i + 1 < len(rows) and rows[i + 1].schema_token == row.schema_token)
+            controls.delete_button.setEnabled(not self.is_fixed_schema(i))
 
-        if previous_row:
-            previous_row.controls.down_button.setEnabled(False)
+    def _schema_token(self, schema: dict) -> int:
+        for token, known_schema in enumerate(self._schema_tokens):
+            if known_schema is schema or known_schema == schema:
+                return token
+
+        self._schema_tokens.append(schema)
+        return len(self._schema_tokens) - 1
 
     def is_fixed_schema(self, index: int) -> bool:
         schema = self.schema['items']
@@ -373,7 +490,7 @@ class ArraySchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
         if isinstance(item_schema, dict):
             return item_schema
 
-        index = len(self.rows)
+        index = len(self._rows)
 
         try:
             item_schema = item_schema[index]
@@ -388,22 +505,215 @@ class ArraySchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
         return item_schema
 
     def add_item(self, item_state=None):
-        self._add_item(item_state)
-        self.on_changed.emit(self.state)
+        row = self._add_item(item_state)
+        self._refresh_controls(row.index - 1)
+        self.emit_state()
 
     def remove_item(self, row: ArrayRowWidget):
-        self._remove_item(row)
-        self.on_changed.emit(self.state)
+        self.remove_items([row])
+
+    def remove_items(self, rows: List[ArrayRowWidget]) -> bool:
+        removed = {r for r in rows if not self.is_fixed_schema(r.index)}
+        if not removed:
+            return False
+
+        first = min(r.index for r in removed)
+        tail = []
+        junctions = []
+        for row in self._rows[first:]:
+            if row in removed:
+                self._remove_item(row)
+                if not junctions or junctions[-1] != first + len(tail):
+                    junctions.append(first + len(tail))
+            else:
+                row.index = first + len(tail)
+                tail.append(row)
+
+        self._rows[first:] = tail
+        self._selected_rows -= removed
+
+        for index in junctions:
+            self._refresh_controls(index - 1, index + 1)
+        self._refresh_controls(len(self._rows) - 1)
+
+        self.emit_state()
+        return True
+
+    def remove_selected(self) -> bool:
+        return self.remove_items(self.selected_rows)
 
     def move_item_up(self, row: ArrayRowWidget):
-        index = self.rows.index(row)
-        self.array_layout.insertWidget(max(0, index - 1), row)
-        self.on_changed.emit(self.state)
+        if row.index > 0:
+            self.move_items([row], row.index - 1)
 
     def move_item_down(self, row: ArrayRowWidget):
-        index = self.rows.index(row)
-        self.array_layout.insertWidget(min(len(self.rows) - 1, index + 1), row)
-        self.on_changed.emit(self.state)
+        if row.index + 1 < len(self._rows):
+            self.move_items([row], row.index + 1)
+
+    def move_items(self, rows: List[ArrayRowWidget], index: int) -> bool:
+        """Move rows (in their current order) such that the first is placed at the given index.
+
+        Only the span of rows between the source and destination positions is touched. The move is
+        rejected if that span contains rows of different item schemas.
+        """
+        rows = sorted(set(rows), key=attrgetter("index"))
+        if not rows:
+            return False
+
+        index = max(0, min(index, len(self._rows) - len(rows)))
+        start = min(rows[0].index, index)
+        stop = max(rows[-1].index + 1, index + len(rows))
+
+        span = self._rows[start:stop]
+        if len({r.schema_token for r in span}) > 1:
+            return False
+
+        moved = set(rows)
+        remaining = [r for r in span if r not in moved]
+        offset = index - start
+        span_order = remaining[:offset] + rows + remaining[offset:]
+        if span_order == span:
+            return False
+
+        for row in span:
+            self.array_layout.removeWidget(row)
+
+        for i, row in enumerate(span_order, start):
+            row.index = i
+            self.array_layout.insertWidget(i, row)
+
+        self._rows[start:stop] = span_order
+        self._refresh_controls(start - 1, stop + 1)
+
+        self.emit_state()
+        return True
+
+    def move_selected(self, offset: int) -> bool:
+        """Move each selected row by offset places.
+
+        Rows stop at either end of the array, at rows with a different item schema, and at other selected rows
+        which cannot move.
+        """
+        step = 1 if offset > 0 else -1
+        rows = self.selected_rows
+        if step > 0:
+            rows.reverse()
+
+        moved = set()
+        for _ in range(abs(offset)):
+            for row in rows:
+                index = row.index
+                other_index = index + step
+                if not 0 <= other_index < len(self._rows):
+                    continue
+
+                # Selected neighbours in the direction of travel have already been moved, or are stuck
+                other = self._rows[other_index]
+                if other.selected or other.schema_token != row.schema_token:
+                    continue
+
+                self._swap_rows(index, other_index)
+                moved.update((index, other_index))
+
+        if not moved:
+            return False
+
+        for index in moved:
+            self._refresh_controls(index - 1, index + 2)
+
+        self.emit_state()
+        return True
+
+    def _swap_rows(self, index: int, other_index: int):
+        first, second = sorted((index, other_index))
+        first_row, second_row = self._rows[first], self._rows[second]
+
+        self.array_layout.removeWidget(first_row)
+        self.array_layout.removeWidget(second_row)
+        self.array_layout.insertWidget(first, second_row)
+        self.array_layout.insertWidget(second, first_row)
+
+        self._rows[first], self._rows[second] = second_row, first_row
+        first_row.index, second_row.index = second, first
+
+    def select_row(self, row: ArrayRowWidget, extend: bool = False):
+        selected = not row.selected or (not extend and len(self._selected_rows) > 1)
+
+        if not extend:
+            for other in self._selected_rows - {row}:
+                other.set_selected(False)
+            self._selected_rows.clear()
+
+        row.set_selected(selected)
+        if selected:
+            self._selected_rows.add(row)
+        else:
+            self._selected_rows.discard(row)
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == QtCore.Qt.Key_Delete and self._selected_rows:
+            self.remove_selected()
+        elif key in (QtCore.Qt.Key_Up, QtCore.Qt.Key_Down) and event.modifiers() & QtCore.Qt.AltModifier:
+            self.move_selected(-1 if key == QtCore.Qt.Key_Up else 1)
+        else:
+            super().keyPressEvent(event)
+
+    def _start_drag(self, row: ArrayRowWidget):
+        rows = self.selected_rows if row.selected else [row]
+
+        mime_data = QtCore.QMimeData()
+        mime_data.setData(self.ROW_MIME_TYPE, QtCore.QByteArray(str(id(self)).encode()))
+
+        drag = QtGui.QDrag(row)
+        drag.setMimeData(mime_data)
+        drag.setPixmap(row.grab())
+
+        self._dragged_rows = rows
+        try:
+            drag.exec_(QtCore.Qt.MoveAction)
+        finally:
+            self._dragged_rows = None
+
+    def _accepts_drag(self, event) -> bool:
+        # Rows can only be dropped within the array that they were dragged from
+        mime_data = event.mimeData()
+        return (self._dragged_rows is not None and mime_data.hasFormat(self.ROW_MIME_TYPE)
+                and bytes(mime_data.data(self.ROW_MIME_TYPE)) == str(id(self)).encode())
+
+    def _drop_index(self, y: int) -> int:
+        """Binary search for the row index before which a drop at height y (in array coordinates) inserts"""
+        low, high = 0, len(self._rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self._rows[middle].geometry().center().y() < y:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def dragEnterEvent(self, event):
+        if self._accepts_drag(event):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event):
+        if self._accepts_drag(event):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):
+        if not self._accepts_drag(event):
+            event.ignore()
+            return
+
+        rows = self._dragged_rows
+        drop_index = self._drop_index(self.array_widget.mapFrom(self, event.pos()).y())
+        index = drop_index - sum(1 for r in rows if r.index < drop_index)
+        self.move_items(rows, index)
+        event.acceptProposedAction()
 
     def _add_item(self, item_state=None):
         item_schema = self.next_item_schema
@@ -414,14 +724,17 @@ class ArraySchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
         controls = ArrayControlsWidget()
 
         # Create row
-        row = ArrayRowWidget(widget, controls)
+        row = ArrayRowWidget(widget, controls, len(self._rows), self._schema_token(item_schema))
         self.array_layout.addWidget(row)
+        self._rows.append(row)
 
         # Setup callbacks
         widget.on_changed.connect(partial(self.widget_on_changed, row))
         controls.on_delete.connect(partial(self.remove_item, row))
         controls.on_move_up.connect(partial(self.move_item_up, row))
         controls.on_move_down.connect(partial(self.move_item_down, row))
+        controls.drag_handle.on_clicked.connect(partial(self.select_row, row))
+        controls.drag_handle.on_drag.connect(partial(self._start_drag, row))
 
         return row
 
@@ -430,8 +743,365 @@ class ArraySchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
         row.deleteLater()
 
     def widget_on_changed(self, row: ArrayRowWidget, value):
-        self.state[self.rows.index(row)] = value
-        self.on_changed.emit(self.state)
+        self.emit_state()
+
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def as_integer(value) -> int:
+    """Convert a value to an integer which fits in the 64-bit integer buffers"""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise TypeError(f"{value!r} is not an integer")
+        value = int(value)
+    else:
+        value = operator.index(value)
+
+    if not INT64_MIN <= value <= INT64_MAX:
+        raise ValueError(f"{value!r} is out of range for a 64-bit integer")
+    return value
+
+
+def make_numeric_buffer(values, integer: bool):
+    """Pack numbers into a NumPy array if available, otherwise a typed array.array.
+
+    Values are converted explicitly, so that both backends reject non-integral values for integer buffers.
+    """
+    values = [as_integer(v) for v in values] if integer else [float(v) for v in values]
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.int64 if integer else numpy.float64)
+    return array.array("q" if integer else "d", values)
+
+
+def make_empty_numeric_buffer(size: int, integer: bool):
+    if numpy is not None:
+        return numpy.zeros(size, dtype=numpy.int64 if integer else numpy.float64)
+
+    typecode = "q" if integer else "d"
+    return array.array(typecode, bytes(size * array.array(typecode).itemsize))
+
+
+def copy_numeric_buffer(target, source, size: int):
+    """Copy the first size values of source into target, without resizing target"""
+    if numpy is not None:
+        target[:size] = source[:size]
+    else:
+        memoryview(target)[:size] = memoryview(source)[:size]
+
+
+class NumericArrayModel(QtCore.QAbstractTableModel):
+    """Single column table model over a typed numeric buffer.
+
+    Values live in the first `size` elements of a storage buffer with spare capacity. The storage is never
+    resized in place; it is only replaced when it runs out of capacity.
+    """
+
+    on_edited = QtCore.Signal()
+
+    def __init__(self, item_schema: dict, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self.item_schema = item_schema
+        self.is_integer = item_schema.get("type") == "integer"
+        self.cast = as_integer if self.is_integer else float
+
+        self.storage = make_empty_numeric_buffer(0, self.is_integer)
+        self.size = 0
+        self.errors = {}
+
+    @property
+    def values(self):
+        """Zero-copy view of the values in the storage buffer"""
+        if numpy is not None:
+            return self.storage[:self.size]
+        return memoryview(self.storage)[:self.size]
+
+    def _reserve(self, size: int):
+        capacity = len(self.storage)
+        if size <= capacity:
+            return
+
+        storage = make_empty_numeric_buffer(max(size, 2 * capacity, 16), self.is_integer)
+        copy_numeric_buffer(storage, self.storage, self.size)
+        self.storage = storage
+
+    def set_values(self, values: list):
+        buffer = make_numeric_buffer(values, self.is_integer)
+
+        self.beginResetModel()
+        self._reserve(len(buffer))
+        copy_numeric_buffer(self.storage, buffer, len(buffer))
+        self.size = len(buffer)
+        self.errors.clear()
+        self.endResetModel()
+
+    def append_value(self, value):
+        value = self.cast(value)
+
+        self.beginInsertRows(QtCore.QModelIndex(), self.size, self.size)
+        self._reserve(self.size + 1)
+        self.storage[self.size] = value
+        self.size += 1
+        self.endInsertRows()
+
+    def remove_values(self, indices: List[int]):
+        removed = set(indices)
+        if numpy is not None:
+            kept = numpy.delete(self.values, sorted(removed))
+        else:
+            kept = array.array(self.storage.typecode, (v for i, v in enumerate(self.values) if i not in removed))
+
+        self.beginResetModel()
+        copy_numeric_buffer(self.storage, kept, len(kept))
+        self.size = len(kept)
+        self.errors.clear()
+        self.endResetModel()
+
+    def set_error(self, row: int, message: str):
+        self.errors[row] = message
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def clear_errors(self):
+        rows, self.errors = [*self.errors], {}
+        for row in rows:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.size
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else 1
+
+    def flags(self, index):
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
+
+    def headerData(self, section: int, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+
+        if orientation == QtCore.Qt.Horizontal:
+            return self.item_schema.get("title", "Value")
+        return str(section)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self.cast(self.storage[row])
+
+        if role == QtCore.Qt.BackgroundRole and row in self.errors:
+            return QtGui.QColor(SchemaWidgetMixin.INVALID_COLOUR)
+
+        if role == QtCore.Qt.ToolTipRole:
+            return self.errors.get(row)
+
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole) -> bool:
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+
+        try:
+            value = self.cast(value)
+        except (TypeError, ValueError, OverflowError):
+            return False
+
+        if not is_valid_number(self.item_schema, value):
+            return False
+
+        self.storage[index.row()] = value
+        self.dataChanged.emit(index, index)
+        self.on_edited.emit()
+        return True
+
+
+class IntegerValidator(QtGui.QValidator):
+    """Validator for integers in an inclusive range, which is not limited to 32 bits like QIntValidator"""
+
+    def __init__(self, minimum: int, maximum: int, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def validate(self, text: str, pos: int):
+        stripped = text.strip()
+        if stripped in ("", "-", "+"):
+            return self.Intermediate, text, pos
+
+        try:
+            value = int(stripped)
+        except ValueError:
+            return self.Invalid, text, pos
+
+        if self.minimum <= value <= self.maximum:
+            return self.Acceptable, text, pos
+
+        # Allow the user to keep typing towards a value within range
+        return self.Intermediate, text, pos
+
+
+class NumericItemDelegate(QtWidgets.QStyledItemDelegate):
+    """Creates editors constrained by the bounds and step of the item schema.
+
+    Integers are edited as text, as spin boxes are limited to 32-bit values.
+    """
+
+    def __init__(self, item_schema: dict, parent: QtCore.QObject = None):
+        super().__init__(parent)
+
+        self.item_schema = item_schema
+        self.is_integer = item_schema.get("type") == "integer"
+
+    def createEditor(self, parent, option, index):
+        schema = self.item_schema
+        minimum, exclusive_minimum, maximum, exclusive_maximum = numeric_bounds(schema)
+
+        if self.is_integer:
+            low, high = INT64_MIN, INT64_MAX
+            if minimum is not None:
+                low = max(low, math.floor(minimum) + 1 if exclusive_minimum else math.ceil(minimum))
+            if maximum is not None:
+                high = min(high, math.ceil(maximum) - 1 if exclusive_maximum else math.floor(maximum))
+
+            editor = QtWidgets.QLineEdit(parent)
+            editor.setValidator(IntegerValidator(low, high, editor))
+        else:
+            editor = QtWidgets.QDoubleSpinBox(parent)
+            editor.setDecimals(10)
+            editor.setRange(
+                -sys.float_info.max if minimum is None else minimum,
+                sys.float_info.max if maximum is None else maximum,
+            )
+            if "multipleOf" in schema:
+                editor.setSingleStep(schema["multipleOf"])
+
+        editor.setFrame(False)
+        return editor
+
+    def setEditorData(self, editor, index):
+        if self.is_integer:
+            editor.setText(str(index.data(QtCore.Qt.EditRole)))
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if self.is_integer:
+            if editor.hasAcceptableInput():
+                model.setData(index, int(editor.text()), QtCore.Qt.EditRole)
+        else:
+            super().setModelData(editor, model, index)
+
+
+class NumericArraySchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
+    """Widget for large arrays of numbers or integers.
+
+    Values are held in a single typed buffer (a NumPy array if NumPy is installed, otherwise an array.array)
+    rather than a widget per item, and are edited through a table view which only renders the visible rows.
+    """
+
+    @state_property
+    def state(self) -> list:
+        return self.model.values.tolist()
+
+    @state.setter
+    def state(self, state: list):
+        self.model.set_values(state)
+        self.emit_state()
+
+    @property
+    def values(self):
+        """Zero-copy view of the values (a NumPy array, or a memoryview over an array.array).
+
+        Edits made through the view or the table are shared. Views cover the length at the time they were
+        taken: after adding, removing or assigning values, take a new view. Adding values may reallocate the
+        storage, after which older views no longer track the widget.
+        """
+        return self.model.values
+
+    def buffer(self) -> memoryview:
+        """Zero-copy memoryview of the values, with the same lifetime rules as `values`"""
+        return memoryview(self.model.values)
+
+    def handle_error(self, path: Tuple[str], err: Exception):
+        if not path:
+            self._set_valid_state(err)
+            return
+
+        index, *tail = path
+        if tail:
+            raise ValueError("Cannot handle nested error by default")
+        self.model.set_error(index, err.message)
+
+    def clear_error(self):
+        super().clear_error()
+        self.model.clear_errors()
+
+    def configure(self):
+        item_schema = self.schema["items"]
+        if not isinstance(item_schema, dict) or item_schema.get("type") not in ("number", "integer"):
+            raise ValueError("Numeric array widget requires a single number or integer items schema")
+
+        layout = QtWidgets.QVBoxLayout()
+        style = self.style()
+
+        self.model = NumericArrayModel(item_schema, self)
+        self.model.on_edited.connect(self.emit_state)
+
+        self.add_button = QtWidgets.QPushButton()
+        self.add_button.setIcon(style.standardIcon(QtWidgets.QStyle.SP_FileIcon))
+        self.add_button.clicked.connect(lambda _: self.add_item())
+
+        self.new_item_value = compute_defaults(item_schema)
+        if self.new_item_value is None:
+            self.new_item_value = first_valid_number(item_schema)
+        self.add_button.setEnabled(self.new_item_value is not None)
+
+        self.remove_button = QtWidgets.QPushButton()
+        self.remove_button.setIcon(style.standardIcon(QtWidgets.QStyle.SP_DialogCancelButton))
+        self.remove_button.clicked.connect(lambda _: self.remove_selected())
+
+        self.table_view = QtWidgets.QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setItemDelegate(NumericItemDelegate(item_schema, self.table_view))
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+
+        # Uniform row heights let the view map scroll offsets to rows without measuring them
+        self.table_view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.add_button)
+        button_layout.addWidget(self.remove_button)
+        button_layout.addStretch(0)
+
+        layout.addLayout(button_layout)
+        layout.addWidget(self.table_view)
+        self.setLayout(layout)
+
+    def add_item(self, value=None):
+        if value is None:
+            value = self.new_item_value
+        if value is None:
+            raise ValueError("Items schema does not admit any value")
+
+        self.model.append_value(value)
+        self.emit_state()
+
+    def remove_selected(self):
+        rows = [i.row() for i in self.table_view.selectionModel().selectedRows()]
+        if not rows:
+            rows = [i.row() for i in self.table_view.selectionModel().selectedIndexes()]
+        if not rows:
+            return
+
+        self.model.remove_values(rows)
+        self.emit_state()
 
 
 class ObjectSchemaWidget(SchemaWidgetMixin, QtWidgets.QGroupBox):
@@ -455,8 +1125,7 @@ class ObjectSchemaWidget(SchemaWidgetMixin, QtWidgets.QGroupBox):
         self.widgets[name].handle_error(tail, err)
 
     def widget_on_changed(self, name: str, value):
-        self.state[name] = value
-        self.on_changed.emit(self.state)
+        self.emit_state()
 
     def populate_from_schema(self, schema: dict, ui_schema: dict, widget_builder: 'WidgetBuilder'
                              ) -> Dict[str, QtWidgets.QWidget]:
@@ -485,6 +1154,228 @@ class ObjectSchemaWidget(SchemaWidgetMixin, QtWidgets.QGroupBox):
         return widgets
 
 
+class VirtualObjectSchemaWidget(SchemaWidgetMixin, QtWidgets.QAbstractScrollArea):
+    """Object widget for very wide schemas.
+
+    Property editors are only created once they scroll into the viewport, and are cached thereafter.
+    Labels are painted directly onto the viewport, so the cost of a resize or scroll depends upon the
+    number of visible rows rather than the number of properties.
+    """
+
+    ROW_SPACING = 6
+
+    # The state reported by a new editor of each type, which is held for rows that are not built yet
+    EMPTY_STATES = {"string": "", "integer": 0, "number": 0.0, "boolean": False}
+
+    def __init__(self, schema: dict, ui_schema: dict, widget_builder: 'WidgetBuilder'):
+        super().__init__(schema, ui_schema, widget_builder)
+
+        self.names = [*schema['properties']]
+        self.labels = [s.get("title", n) for n, s in schema['properties'].items()]
+        self.widgets = {}
+
+        self._values = {n: self._initial_state(s) for n, s in schema['properties'].items()}
+        self._pending_errors = {}
+        self._visible_rows = []
+        self._label_width = None
+
+        self._estimated_row_height = QtWidgets.QLineEdit().sizeHint().height()
+        self._row_heights = [self._estimated_row_height] * len(self.names)
+        self._row_offsets = None
+
+        if 'description' in schema:
+            self.setToolTip(schema['description'])
+
+        self._measure_timer = QtCore.QTimer(self)
+        self._measure_timer.setSingleShot(True)
+        self._measure_timer.setInterval(0)
+        self._measure_timer.timeout.connect(self._measure_visible_rows)
+
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(self._estimated_row_height)
+
+    @state_property
+    def state(self) -> dict:
+        widgets = self.widgets
+        values = self._values
+        return {n: widgets[n].state if n in widgets else values[n] for n in self.names}
+
+    @state.setter
+    def state(self, state: dict):
+        changed = False
+        for name, value in state.items():
+            if name in self.widgets:
+                self.widgets[name].state = value
+            elif value is not None and value != self._values[name]:
+                # Rows which are not built yet have no editor to emit on their behalf
+                self._values[name] = value
+                self._pending_errors.pop(name, None)
+                changed = True
+
+        if changed:
+            self.emit_state()
+
+    def handle_error(self, path: Tuple[str], err: Exception):
+        if not path:
+            self._set_valid_state(err)
+            return
+
+        name, *tail = path
+        try:
+            widget = self.widgets[name]
+        except KeyError:
+            if err is None:
+                self._pending_errors.pop(name, None)
+            else:
+                self._pending_errors[name] = (tail, err)
+        else:
+            widget.handle_error(tail, err)
+
+    def clear_pending_errors(self):
+        """Forget errors held for rows which are not built yet, before a new validation pass"""
+        self._pending_errors.clear()
+
+    def widget_on_changed(self, name: str, value):
+        self._pending_errors.pop(name, None)
+        self.emit_state()
+
+    def _initial_state(self, schema: dict):
+        state = compute_defaults(schema)
+        if state is not None:
+            return state
+
+        if is_conditional_schema(schema):
+            schema = next(iter_schema_branches(schema))
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = schema_type[0] if schema_type else None
+        return self.EMPTY_STATES.get(schema_type)
+
+    @property
+    def label_width(self) -> int:
+        if self._label_width is None:
+            metrics = self.fontMetrics()
+            self._label_width = max((metrics.horizontalAdvance(l) for l in self.labels), default=0)
+        return self._label_width
+
+    @property
+    def row_offsets(self) -> List[int]:
+        if self._row_offsets is None:
+            self._row_offsets = [0, *accumulate(h + self.ROW_SPACING for h in self._row_heights)]
+        return self._row_offsets
+
+    def _materialise(self, index: int) -> QtWidgets.QWidget:
+        name = self.names[index]
+        try:
+            return self.widgets[name]
+        except KeyError:
+            pass
+
+        sub_schema = self.schema['properties'][name]
+        sub_ui_schema = self.ui_schema.get(name, {})
+        widget = self.widget_builder.create_widget(sub_schema, sub_ui_schema, self._values.pop(name))
+        widget.on_changed.connect(partial(self.widget_on_changed, name))
+        widget.setParent(self.viewport())
+        self.widgets[name] = widget
+
+        if name in self._pending_errors:
+            widget.handle_error(*self._pending_errors.pop(name))
+
+        self._measure_row(index, widget)
+        return widget
+
+    def _measure_row(self, index: int, widget: QtWidgets.QWidget) -> bool:
+        # Editors are not in a layout, so their own layout is activated here. Until it is, changes to
+        # their contents do not post further layout requests.
+        layout = widget.layout()
+        if layout is not None:
+            layout.activate()
+
+        height = widget.sizeHint().height()
+        if height == self._row_heights[index]:
+            return False
+
+        self._row_heights[index] = height
+        self._row_offsets = None
+        return True
+
+    def _update_viewport(self):
+        top = self.verticalScrollBar().value()
+        viewport = self.viewport()
+        bottom = top + viewport.height()
+        editor_x = self.label_width + self.ROW_SPACING
+        editor_width = max(0, viewport.width() - editor_x)
+
+        first = max(0, bisect_right(self.row_offsets, top) - 1)
+        y = self.row_offsets[first]
+
+        visible_rows = []
+        for index in range(first, len(self.names)):
+            if y >= bottom:
+                break
+
+            widget = self._materialise(index)
+            height = self._row_heights[index]
+            widget.setGeometry(editor_x, y - top, editor_width, height)
+            widget.show()
+
+            visible_rows.append((index, y - top, height))
+            y += height + self.ROW_SPACING
+
+        visible = {i for i, *_ in visible_rows}
+        for index, *_ in self._visible_rows:
+            if index not in visible:
+                self.widgets[self.names[index]].hide()
+
+        self._visible_rows = visible_rows
+
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setPageStep(viewport.height())
+        scroll_bar.setRange(0, max(0, self.row_offsets[-1] - viewport.height()))
+
+        viewport.update()
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        self._update_viewport()
+
+    def event(self, event):
+        # A layout request is posted when the size hint of an editor changes, e.g. a nested array gaining
+        # items. Nested layouts settle over several requests, so the visible rows are measured once they have.
+        if event.type() == QtCore.QEvent.LayoutRequest:
+            self._measure_timer.start()
+        return super().event(event)
+
+    def _measure_visible_rows(self):
+        resized = False
+        for index, *_ in self._visible_rows:
+            resized |= self._measure_row(index, self.widgets[self.names[index]])
+
+        if resized:
+            self._update_viewport()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_viewport()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_viewport()
+
+    def changeEvent(self, event):
+        if event.type() == QtCore.QEvent.FontChange:
+            self._label_width = None
+            self._update_viewport()
+        super().changeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self.viewport())
+        label_width = self.label_width
+        for index, y, height in self._visible_rows:
+            rect = QtCore.QRect(0, y, label_width, height)
+            painter.drawText(rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, self.labels[index])
+
+
 class EnumSchemaWidget(SchemaWidgetMixin, QtWidgets.QComboBox):
 
     @state_property
@@ -504,15 +1395,192 @@ class EnumSchemaWidget(SchemaWidgetMixin, QtWidgets.QComboBox):
             self.addItem(str(opt))
             self.setItemData(i, opt)
 
-        self.currentIndexChanged.connect(lambda _: self.on_changed.emit(self.state))
+        self.currentIndexChanged.connect(lambda _: self.emit_state())
 
     def _index_changed(self, index: int):
-        self.on_changed.emit(self.state)
+        self.emit_state()
+
+
+class ConditionalSchemaWidget(SchemaWidgetMixin, QtWidgets.QWidget):
+    """Widget for oneOf / anyOf / if-then-else schemas.
+
+    Each branch is given its own widget, which is built on first use and cached thereafter. The branch of
+    a new state is found with discriminators compiled from the branch schemas (`const` properties, the
+    `if` schema, and finally `type` tags), rather than by validating the state against every branch.
+    Branches which the widget builder cannot render are shown, but cannot be selected.
+    """
+
+    @state_property
+    def state(self):
+        return self.current_widget.state
+
+    @state.setter
+    def state(self, state):
+        index = self.match_branch(state)
+        if index is not None and index != self.current_index:
+            self._show_branch(index)
+        self.current_widget.state = state
+
+    @property
+    def is_if_then_else(self) -> bool:
+        return "oneOf" not in self.schema and "anyOf" not in self.schema
+
+    @property
+    def current_index(self) -> int:
+        return self.stacked_widget.currentIndex()
+
+    @property
+    def current_widget(self) -> SchemaWidgetMixin:
+        return self.stacked_widget.currentWidget()
+
+    def handle_error(self, path: Tuple[str], err: Exception):
+        if path:
+            self.current_widget.handle_error(path, err)
+        else:
+            self._set_valid_state(err)
+
+    def configure(self):
+        self.branch_schemas = [*iter_schema_branches(self.schema)]
+        self.widgets = {}
+
+        self._branch_ui_schema = {k: v for k, v in self.ui_schema.items() if k != "ui:widget"}
+        self.renderable = [self.widget_builder.can_create_widget(s, self._branch_ui_schema)
+                           for s in self.branch_schemas]
+        if not any(self.renderable):
+            raise ValueError("None of the branches of the schema can be rendered")
+
+        self._compile_discriminators()
+
+        layout = QtWidgets.QVBoxLayout()
+        self.setLayout(layout)
+
+        self.branch_widget = QtWidgets.QComboBox()
+        if self.is_if_then_else:
+            branches = [self.schema.get("then", {}), self.schema.get("else", {})]
+        else:
+            branches = self.schema.get("oneOf", self.schema.get("anyOf"))
+        for i, branch in enumerate(branches):
+            self.branch_widget.addItem(branch.get("title", f"Option {i + 1}"))
+            if not self.renderable[i]:
+                self.branch_widget.model().item(i).setEnabled(False)
+
+        self.stacked_widget = QtWidgets.QStackedWidget()
+        for _ in self.branch_schemas:
+            self.stacked_widget.addWidget(QtWidgets.QWidget())
+
+        layout.addWidget(self.branch_widget)
+        layout.addWidget(self.stacked_widget)
+
+        self._show_branch(self.renderable.index(True))
+        self.branch_widget.currentIndexChanged.connect(self._on_branch_changed)
+
+    def _compile_discriminators(self):
+        # Map (property, const) and type tags to the first branch which declares them
+        self._const_discriminators = {}
+        self._type_discriminators = {}
+
+        for i, branch in enumerate(self.branch_schemas):
+            for name, sub_schema in branch.get("properties", {}).items():
+                if "const" not in sub_schema:
+                    continue
+
+                key = _const_key(sub_schema["const"])
+                if key is not None:
+                    self._const_discriminators.setdefault((name, key), i)
+
+            types = branch.get("type", [])
+            for schema_type in [types] if isinstance(types, str) else types:
+                self._type_discriminators.setdefault(schema_type, i)
+
+        self._discriminator_properties = {n for n, _ in self._const_discriminators}
+
+        self._if_validator = None
+        if self.is_if_then_else:
+            if_schema = self.schema["if"]
+            validator_cls = self.widget_builder.validator_cls or validator_for(if_schema)
+            self._if_validator = validator_cls(if_schema, format_checker=self.widget_builder.format_checker)
+
+    def match_branch(self, state) -> Optional[int]:
+        index = self._discriminate(state)
+
+        # An object state can only be shown by a branch which has all of its properties
+        if isinstance(state, dict) and (index is None or not self._has_properties(index, state)):
+            index = next((i for i in range(len(self.branch_schemas)) if self._has_properties(i, state)), index)
+
+        if index is None or not self.renderable[index]:
+            return None
+        return index
+
+    def _has_properties(self, index: int, state: dict) -> bool:
+        properties = self.branch_schemas[index].get("properties")
+        return self.renderable[index] and properties is not None and state.keys() <= properties.keys()
+
+    def _discriminate(self, state) -> Optional[int]:
+        if isinstance(state, dict):
+            for name in self._discriminator_properties.intersection(state):
+                try:
+                    return self._const_discriminators[name, _const_key(state[name])]
+                except (KeyError, TypeError):
+                    continue
+
+        if self._if_validator is not None:
+            return 0 if self._if_validator.is_valid(state) else 1
+
+        try:
+            schema_type = json_type_of(state)
+        except TypeError:
+            return None
+
+        index = self._type_discriminators.get(schema_type)
+        if index is None and schema_type == "integer":
+            index = self._type_discriminators.get("number")
+        return index
+
+    def _get_branch_widget(self, index: int) -> SchemaWidgetMixin:
+        try:
+            return self.widgets[index]
+        except KeyError:
+            pass
+
+        widget = self.widget_builder.create_widget(self.branch_schemas[index], self._branch_ui_schema)
+        widget.on_changed.connect(partial(self.widget_on_changed, index))
+
+        placeholder = self.stacked_widget.widget(index)
+        self.stacked_widget.insertWidget(index, widget)
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+        self.widgets[index] = widget
+        return widget
+
+    def _show_branch(self, index: int):
+        widget = self._get_branch_widget(index)
+        self.stacked_widget.setCurrentWidget(widget)
+
+        blocked = self.branch_widget.blockSignals(True)
+        self.branch_widget.setCurrentIndex(index)
+        self.branch_widget.blockSignals(blocked)
+
+    def _on_branch_changed(self, index: int):
+        self._show_branch(index)
+        self.emit_state()
+
+    def widget_on_changed(self, index: int, value):
+        if index == self.current_index:
+            self.on_changed.emit(value)
+
+
+def _const_key(value):
+    # Keep booleans distinct from the integers that they compare equal to
+    if isinstance(value, (dict, list)):
+        return None
+    return isinstance(value, bool), value
 
 
 class FormWidget(QtWidgets.QWidget):
 
-    def __init__(self, widget: SchemaWidgetMixin):
+    def __init__(self, widget: SchemaWidgetMixin, metrics: 'FormMetrics' = None,
+                 virtual_widgets: Iterable['VirtualObjectSchemaWidget'] = ()):
         super().__init__()
         layout = QtWidgets.QVBoxLayout()
         self.setLayout(layout)
@@ -527,20 +1595,32 @@ class FormWidget(QtWidgets.QWidget):
         layout.addWidget(widget)
 
         self.widget = widget
+        self.metrics = metrics
+        self.virtual_widgets = virtual_widgets
+
+    @contextmanager
+    def bulk_mutation(self):
+        """Apply many changes to the form with a single repaint, relayout and on_changed emission"""
+        with suspended_updates(self), coalesced_signals(self.widget):
+            yield
 
     def display_errors(self, errors: List[Exception]):
         self.error_widget.show()
 
-        layout = self.error_widget.layout()
-        while True:
-            item = layout.takeAt(0)
-            if not item:
-                break
-            item.widget().deleteLater()
+        with suspended_updates(self.error_widget):
+            layout = self.error_widget.layout()
+            while True:
+                item = layout.takeAt(0)
+                if not item:
+                    break
+                item.widget().deleteLater()
 
-        for err in errors:
-            widget = QtWidgets.QLabel(f"<b>.{'.'.join(err.path)}</b> {err.message}")
-            layout.addWidget(widget)
+            for err in errors:
+                widget = QtWidgets.QLabel(f"<b>.{'.'.join(err.path)}</b> {err.message}")
+                layout.addWidget(widget)
 
     def clear_errors(self):
         self.error_widget.hide()
+
+        for widget in self.virtual_widgets:
+            widget.clear_pending_errors()
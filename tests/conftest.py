@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy import QtWidgets  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    yield app
+
+
+@pytest.fixture
+def builder(qapp):
+    from qt_jsonschema_form.form import WidgetBuilder
+
+    return WidgetBuilder()
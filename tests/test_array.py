@@ -0,0 +1,162 @@
+import pytest
+
+
+@pytest.fixture
+def array_widget(builder):
+    schema = {"type": "array", "items": {"type": "integer"}}
+    return builder.create_widget(schema, {}, [0, 1, 2, 3, 4, 5])
+
+
+@pytest.fixture
+def mixed_array_widget(builder):
+    # Two fixed string items, followed by integers
+    schema = {"type": "array", "items": [{"type": "string"}, {"type": "string"}],
+              "additionalItems": {"type": "integer"}}
+    return builder.create_widget(schema, {}, ["a", "b", 1, 2, 3])
+
+
+def check_rows(widget):
+    rows = widget.rows
+    assert [r.index for r in rows] == [*range(len(rows))]
+    assert [widget.array_layout.indexOf(r) for r in rows] == [*range(len(rows))]
+
+
+def button_states(widget):
+    return [(r.controls.up_button.isEnabled(), r.controls.down_button.isEnabled()) for r in widget.rows]
+
+
+def select(widget, *indices):
+    for index in indices:
+        widget.select_row(widget.rows[index], extend=True)
+
+
+def test_move_items(array_widget):
+    emitted = []
+    array_widget.on_changed.connect(emitted.append)
+
+    assert array_widget.move_items([array_widget.rows[1], array_widget.rows[3]], 3)
+
+    assert array_widget.state == [0, 2, 4, 1, 3, 5]
+    assert emitted == [[0, 2, 4, 1, 3, 5]]
+    check_rows(array_widget)
+    assert button_states(array_widget)[0] == (False, True)
+    assert button_states(array_widget)[-1] == (True, False)
+
+
+def test_move_items_to_current_position_is_rejected(array_widget):
+    assert not array_widget.move_items([array_widget.rows[2]], 2)
+    assert array_widget.state == [0, 1, 2, 3, 4, 5]
+
+
+def test_move_item_up_and_down(array_widget):
+    array_widget.move_item_up(array_widget.rows[0])
+    array_widget.move_item_down(array_widget.rows[5])
+    assert array_widget.state == [0, 1, 2, 3, 4, 5]
+
+    array_widget.move_item_down(array_widget.rows[0])
+    assert array_widget.state == [1, 0, 2, 3, 4, 5]
+    check_rows(array_widget)
+
+
+def test_move_selected_keeps_rows_apart(array_widget):
+    select(array_widget, 1, 4)
+    emitted = []
+    array_widget.on_changed.connect(emitted.append)
+
+    assert array_widget.move_selected(-1)
+
+    assert array_widget.state == [1, 0, 2, 4, 3, 5]
+    assert [r.index for r in array_widget.selected_rows] == [0, 3]
+    assert len(emitted) == 1
+    check_rows(array_widget)
+
+
+def test_move_selected_stops_at_ends_and_selected_rows(array_widget):
+    select(array_widget, 0, 1, 4)
+
+    assert array_widget.move_selected(-2)
+
+    assert array_widget.state == [0, 1, 4, 2, 3, 5]
+    assert [r.index for r in array_widget.selected_rows] == [0, 1, 2]
+    check_rows(array_widget)
+
+    assert not array_widget.move_selected(-1)
+
+
+def test_move_selected_by_several_places(array_widget):
+    select(array_widget, 0, 2)
+
+    assert array_widget.move_selected(3)
+
+    assert array_widget.state == [1, 3, 4, 0, 5, 2]
+    check_rows(array_widget)
+
+
+def test_mixed_schemas_block_moves(mixed_array_widget):
+    widget = mixed_array_widget
+    rows = widget.rows
+
+    assert button_states(widget) == [(False, True), (True, False), (False, True), (True, True), (True, False)]
+    assert [r.controls.delete_button.isEnabled() for r in rows] == [False, False, True, True, True]
+
+    assert not widget.move_items([rows[2]], 1)
+    assert not widget.move_items([rows[0]], 3)
+    assert widget.state == ["a", "b", 1, 2, 3]
+
+    # The string row is stuck behind an integer row, whilst the integer row moves on
+    select(widget, 1, 2)
+    assert widget.move_selected(1)
+    assert widget.state == ["a", "b", 2, 1, 3]
+    check_rows(widget)
+
+    widget.select_row(rows[2])
+    assert widget.move_selected(-1)
+    assert widget.state == ["a", "b", 1, 2, 3]
+    assert not widget.move_selected(-1)
+    assert widget.state == ["a", "b", 1, 2, 3]
+    check_rows(widget)
+
+
+def test_remove_items(array_widget):
+    emitted = []
+    array_widget.on_changed.connect(emitted.append)
+    rows = array_widget.rows
+
+    assert array_widget.remove_items([rows[1], rows[2], rows[4]])
+
+    assert array_widget.state == [0, 3, 5]
+    assert len(emitted) == 1
+    check_rows(array_widget)
+    assert button_states(array_widget) == [(False, True), (True, True), (True, False)]
+
+
+def test_remove_selected(array_widget):
+    select(array_widget, 0, 5)
+
+    assert array_widget.remove_selected()
+
+    assert array_widget.state == [1, 2, 3, 4]
+    assert array_widget.selected_rows == []
+    check_rows(array_widget)
+    assert button_states(array_widget)[0] == (False, True)
+    assert button_states(array_widget)[-1] == (True, False)
+
+
+def test_fixed_items_are_not_removed(mixed_array_widget):
+    widget = mixed_array_widget
+    rows = widget.rows
+
+    assert not widget.remove_items(rows[:2])
+    assert widget.remove_items([rows[1], rows[3]])
+
+    assert widget.state == ["a", "b", 1, 3]
+    check_rows(widget)
+    assert button_states(widget) == [(False, True), (True, False), (False, True), (True, False)]
+
+
+def test_add_item_updates_neighbour_controls(array_widget):
+    array_widget.add_item(6)
+
+    assert array_widget.state == [0, 1, 2, 3, 4, 5, 6]
+    check_rows(array_widget)
+    assert button_states(array_widget)[-2:] == [(True, True), (True, False)]
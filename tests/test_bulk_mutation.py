@@ -0,0 +1,78 @@
+import pytest
+
+from qt_jsonschema_form.signal import BoundSignal
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "inner": {"type": "object", "properties": {"count": {"type": "integer"}}},
+        "items": {"type": "array", "items": {"type": "string"}},
+    },
+}
+
+
+def test_coalesced_emits_latest_once():
+    signal = BoundSignal()
+    emitted = []
+    signal.connect(lambda *args: emitted.append(args))
+
+    with signal.coalesced():
+        with signal.coalesced():
+            signal.emit(1)
+            signal.emit_lazy(lambda: (2,))
+        assert emitted == []
+        signal.emit(3)
+
+    assert emitted == [(3,)]
+
+
+def test_coalesced_without_emission_is_silent():
+    signal = BoundSignal()
+    emitted = []
+    signal.connect(emitted.append)
+
+    with signal.coalesced():
+        pass
+
+    assert emitted == []
+
+
+def test_bulk_mutation_emits_once(builder):
+    form = builder.create_form(SCHEMA, {})
+    widget = form.widget
+    emitted = []
+    widget.on_changed.connect(emitted.append)
+
+    with form.bulk_mutation():
+        widget.widgets["name"].state = "x"
+        widget.widgets["inner"].widgets["count"].state = 3
+        items = widget.widgets["items"]
+        for i in range(5):
+            items.add_item(str(i))
+        items.move_items([items.rows[4]], 0)
+        items.remove_items(items.rows[1:3])
+
+    expected = {"name": "x", "inner": {"count": 3}, "items": ["4", "2", "3"]}
+    assert emitted == [expected]
+    assert form.updatesEnabled()
+
+
+def test_bulk_mutation_releases_on_error(builder):
+    form = builder.create_form(SCHEMA, {})
+    widget = form.widget
+    emitted = []
+    widget.on_changed.connect(emitted.append)
+
+    with pytest.raises(RuntimeError):
+        with form.bulk_mutation():
+            widget.widgets["name"].state = "x"
+            raise RuntimeError
+
+    # The change made before the error is still emitted, and later edits are not held back
+    assert [e["name"] for e in emitted] == ["x"]
+    assert not widget.on_changed.blocked
+    assert form.updatesEnabled()
+
+    widget.widgets["name"].state = "y"
+    assert [e["name"] for e in emitted] == ["x", "y"]
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import pytest
+from qtpy import QtWidgets
+
+from qt_jsonschema_form import checks
+from qt_jsonschema_form.checks import AsyncFormatChecker, DaemonExecutor
+from qt_jsonschema_form.form import WidgetBuilder
+
+
+def wait_until(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        QtWidgets.QApplication.processEvents()
+        time.sleep(0.005)
+
+
+class Clock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(checks, "monotonic", clock)
+    return clock
+
+
+class BlockingCheck:
+    """Check which records its calls, and blocks until released"""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, value: str) -> bool:
+        self.calls.append(value)
+        self.started.set()
+        self.release.wait(2)
+        return value.startswith("/")
+
+
+def test_in_flight_checks_are_shared(qapp):
+    check = BlockingCheck()
+    checker = AsyncFormatChecker({"path": check})
+    results = []
+
+    assert checker.request("a", "path", "/x", results.append) is None
+    assert checker.request("b", "path", "/x", results.append) is None
+
+    check.release.set()
+    wait_until(lambda: len(results) == 2)
+
+    assert check.calls == ["/x"]
+    assert results == [True, True]
+    assert checker.lookup("path", "/x") == (True, True)
+    checker.shutdown()
+
+
+def test_superseded_checks_are_cancelled(qapp):
+    check = BlockingCheck()
+    checker = AsyncFormatChecker({"path": check}, max_workers=1)
+    results = []
+
+    # The worker is busy with the first check, so the others are queued
+    checker.request("a", "path", "/busy", results.append)
+    assert check.started.wait(2)
+    checker.request("b", "path", "y", results.append)
+    checker.request("b", "path", "z", results.append)
+
+    # A check that another requester is waiting on is kept
+    checker.request("c", "path", "/w", results.append)
+    checker.request("d", "path", "/w", results.append)
+    checker.request("c", "path", "/v", results.append)
+
+    check.release.set()
+    wait_until(lambda: len(results) == 4)
+
+    assert check.calls == ["/busy", "z", "/w", "/v"]
+    assert sorted(results) == [False, True, True, True]
+    checker.shutdown()
+
+
+def test_cache_is_pruned_by_use(qapp):
+    check = BlockingCheck()
+    check.release.set()
+    checker = AsyncFormatChecker({"path": check}, max_cache_size=2)
+    results = []
+
+    for value in ("/a", "/b"):
+        checker.request("r", "path", value, results.append)
+        wait_until(lambda: checker.lookup("path", value)[0] is not None)
+
+    # Using /a makes /b the least recently used result
+    checker.lookup("path", "/a")
+    checker.request("r", "path", "/c", results.append)
+    wait_until(lambda: checker.lookup("path", "/c")[0] is not None)
+
+    assert [*checker._cache] == [("path", "/a"), ("path", "/c")]
+    checker.shutdown()
+
+
+def test_stale_results_are_kept_until_rechecked(qapp, clock):
+    check = BlockingCheck()
+    check.release.set()
+    checker = AsyncFormatChecker({"path": check}, cache_ttl=5.0)
+    results = []
+
+    checker.request("r", "path", "/a", results.append)
+    wait_until(lambda: results)
+
+    clock.now += 10
+    assert checker.lookup("path", "/a") == (True, False)
+
+    check.release.clear()
+    assert checker.request("r", "path", "/a", results.append) is None
+    assert checker.lookup("path", "/a") == (True, False)
+
+    check.release.set()
+    wait_until(lambda: len(results) == 2)
+    assert checker.lookup("path", "/a") == (True, True)
+    assert check.calls == ["/a", "/a"]
+    checker.shutdown()
+
+
+def test_shutdown_cancels_queued_checks():
+    check = BlockingCheck()
+    executor = DaemonExecutor(1)
+
+    running = executor.submit(check, "/a")
+    assert check.started.wait(2)
+    queued = executor.submit(lambda: None)
+    executor.shutdown(cancel_futures=True)
+    check.release.set()
+
+    assert running.result(2) is True
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+
+
+def test_form_shows_stale_results_whilst_rechecking(qapp, clock):
+    check = BlockingCheck()
+    check.release.set()
+    schema = {"type": "object", "properties": {"path": {"type": "string", "format": "filepath"},
+                                               "name": {"type": "string"}}}
+    builder = WidgetBuilder(async_format_checks={"filepath": check})
+    form = builder.create_form(schema, {}, {"path": "/a", "name": ""})
+    path_widget = form.widget.widgets["path"]
+    name_widget = form.widget.widgets["name"]
+
+    name_widget.state = "x"
+    assert path_widget.pending
+    wait_until(lambda: not path_widget.pending)
+    assert form.error_widget.isHidden()
+
+    # Once stale, the result is still shown whilst the value is checked again
+    clock.now += 60
+    check.release.clear()
+    name_widget.state = "y"
+    assert not path_widget.pending
+    wait_until(lambda: len(check.calls) == 2)
+    assert not path_widget.pending
+
+    check.release.set()
+    wait_until(lambda: builder.async_format_checker.lookup("filepath", "/a") == (True, True))
+    assert not path_widget.pending
+    assert form.error_widget.isHidden()
+
+    # A value which is edited away before its check starts is never checked
+    path_widget.state = "b"
+    path_widget.state = "bad"
+    wait_until(lambda: not path_widget.pending)
+    assert check.calls[2:] == ["bad"]
+    assert not form.error_widget.isHidden()
+    builder.async_format_checker.shutdown()
@@ -0,0 +1,65 @@
+from jsonschema import Draft7Validator
+from jsonschema.validators import extend
+
+from qt_jsonschema_form import widgets
+from qt_jsonschema_form.form import WidgetBuilder
+
+
+def test_nullable_branch(builder):
+    form = builder.create_form({"anyOf": [{"type": "string"}, {"type": "null"}]}, {})
+    widget = form.widget
+
+    widget.branch_widget.setCurrentIndex(1)
+
+    assert isinstance(widget.current_widget, widgets.NullSchemaWidget)
+    assert widget.state is None
+    assert form.error_widget.isHidden()
+
+    widget.state = "text"
+    assert widget.current_index == 0
+    assert widget.state == "text"
+
+
+def test_unrenderable_branch_is_disabled(builder):
+    widget = builder.create_widget({"anyOf": [{}, {"type": "integer"}]}, {})
+
+    assert widget.renderable == [False, True]
+    assert widget.current_index == 1
+    assert not widget.branch_widget.model().item(0).isEnabled()
+    assert widget.match_branch({"a": 1}) is None
+
+
+def test_conditional_enum(builder):
+    schema = {"enum": ["a", "b", 1], "anyOf": [{"type": "string"}, {"type": "integer"}]}
+    form = builder.create_form(schema, {})
+
+    assert isinstance(form.widget, widgets.EnumSchemaWidget)
+    assert form.widget.state == "a"
+
+
+def test_if_then_else_falls_back_to_branch_with_properties(builder):
+    schema = {
+        "type": "object",
+        "if": {"properties": {"k": {"const": 1}}},
+        "then": {"properties": {"k": {"type": "integer"}, "a": {"type": "string"}}},
+        "else": {"properties": {"b": {"type": "string"}}},
+    }
+    form = builder.create_form(schema, {}, {"b": "x"})
+
+    assert form.widget.current_index == 1
+    assert form.widget.state == {"b": "x"}
+
+    form.widget.state = {"k": 1, "a": "y"}
+    assert form.widget.current_index == 0
+    assert form.widget.state == {"k": 1, "a": "y"}
+
+
+def test_if_validator_uses_form_validator(qapp):
+    Validator = extend(Draft7Validator, {})
+
+    schema = {"if": {"type": "integer"}, "then": {"type": "integer"}, "else": {"type": "string"}}
+    form = WidgetBuilder(validator_cls=Validator).create_form(schema, {})
+
+    assert isinstance(form.widget._if_validator, Validator)
+    assert form.widget.match_branch(3) == 0
+    assert form.widget.match_branch("x") == 1
@@ -0,0 +1,114 @@
+import pytest
+from qtpy import QtCore, QtWidgets
+
+from qt_jsonschema_form import metrics as metrics_module
+from qt_jsonschema_form.metrics import FormMetrics, LatencyHistogram
+
+SCHEMA = {"type": "object", "properties": {"name": {"type": "string"}, "count": {"type": "integer"}}}
+
+
+class Clock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(metrics_module, "perf_counter", clock)
+    return clock
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(window=3)
+    for seconds in (0.0001, 0.003, 0.004, 2.0):
+        histogram.record(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["window"] == 3
+    assert snapshot["max_ms"] == 2000
+    assert snapshot["buckets"]["<=5ms"] == 2
+    assert snapshot["buckets"][">1000ms"] == 1
+
+
+def test_rate_windows(builder, clock):
+    form_metrics = FormMetrics(rate_window=5.0)
+    widget = builder.create_widget({"type": "string"}, {})
+    form_metrics.watch(widget)
+
+    for i in range(10):
+        widget.state = str(i)
+
+    def rate():
+        field, = form_metrics.snapshot()["fields"].values()
+        return field["emissions_per_second"]
+
+    clock.now = 101.0
+    assert rate() == pytest.approx(2.0)
+
+    # The previous window is weighted by its overlap with the trailing five seconds
+    clock.now = 106.0
+    assert rate() == pytest.approx(1.6)
+
+    clock.now = 111.0
+    assert rate() == 0.0
+    assert form_metrics.snapshot()["fields"]["."]["emissions"] == 10
+
+
+def test_build_emissions_are_not_edits(builder):
+    form = builder.create_form(SCHEMA, {}, {"name": "x", "count": 2}, metrics=True)
+    form_metrics = form.metrics
+
+    assert form_metrics._edit_started is None
+
+    form.widget.widgets["name"].state = "y"
+
+    snapshot = form_metrics.snapshot()
+    assert snapshot["validations"] == 1
+    assert snapshot["edit_to_validated"]["count"] == 1
+    assert snapshot["fields"][".name"]["emissions"] == 2
+
+
+def test_reset_edit(builder):
+    form_metrics = FormMetrics()
+    widget = builder.create_widget({"type": "string"}, {})
+    form_metrics.watch(widget)
+
+    widget.state = "x"
+    form_metrics.reset_edit()
+    form_metrics.record_validation(metrics_module.perf_counter())
+
+    assert form_metrics.validations == 1
+    assert form_metrics.edit_to_validated.count == 0
+
+
+def test_unvalidated_emission_is_discarded(builder):
+    form_metrics = FormMetrics()
+    widget = builder.create_widget({"type": "string"}, {})
+    form_metrics.watch(widget)
+
+    widget.state = "x"
+    QtWidgets.QApplication.processEvents()
+    form_metrics.record_validation(metrics_module.perf_counter())
+
+    assert form_metrics.edit_to_validated.count == 0
+
+
+def test_destroyed_widgets_are_forgotten(builder):
+    form_metrics = FormMetrics()
+    widgets = [builder.create_widget({"type": "string"}, {}) for _ in range(3)]
+    for widget in widgets:
+        form_metrics.watch(widget)
+    assert form_metrics.snapshot()["widgets"] == 3
+
+    widgets[0].deleteLater()
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+
+    snapshot = form_metrics.snapshot()
+    assert snapshot["widgets"] == 2
+    assert snapshot["widget_counts"] == {"TextSchemaWidget": 2}
+    assert len(form_metrics._records) == 2
@@ -0,0 +1,77 @@
+import pytest
+from qtpy import QtWidgets
+
+from qt_jsonschema_form import widgets
+
+INTEGER_SCHEMA = {"type": "array", "items": {"type": "integer"}}
+
+
+def edit(widget, row: int, text: str = None):
+    view = widget.table_view
+    delegate = view.itemDelegate()
+    index = widget.model.index(row, 0)
+
+    editor = delegate.createEditor(view.viewport(), QtWidgets.QStyleOptionViewItem(), index)
+    delegate.setEditorData(editor, index)
+    if text is not None:
+        editor.setText(text)
+    delegate.setModelData(editor, widget.model, index)
+    return editor
+
+
+@pytest.mark.parametrize("value", [2 ** 40, -2 ** 63, 2 ** 63 - 1])
+def test_large_integers_survive_editing(builder, value):
+    widget = builder.create_widget(INTEGER_SCHEMA, {"ui:widget": "table"}, [value])
+
+    editor = edit(widget, 0)
+
+    assert editor.text() == str(value)
+    assert widget.state == [value]
+
+
+def test_integer_editor_respects_bounds(builder):
+    schema = {"type": "array", "items": {"type": "integer", "minimum": 0, "exclusiveMaximum": 10}}
+    widget = builder.create_widget(schema, {"ui:widget": "table"}, [1])
+
+    edit(widget, 0, "10")
+    assert widget.state == [1]
+
+    edit(widget, 0, str(2 ** 70))
+    assert widget.state == [1]
+
+    edit(widget, 0, "9")
+    assert widget.state == [9]
+
+
+def test_out_of_range_state_is_rejected(builder):
+    widget = builder.create_widget(INTEGER_SCHEMA, {"ui:widget": "table"})
+
+    with pytest.raises(ValueError, match="64-bit"):
+        widget.state = [2 ** 70]
+
+    with pytest.raises(ValueError, match="64-bit"):
+        widget.add_item(-2 ** 63 - 1)
+
+
+def test_as_integer():
+    assert widgets.as_integer(3.0) == 3
+    assert widgets.as_integer(2 ** 63 - 1) == 2 ** 63 - 1
+
+    with pytest.raises(TypeError):
+        widgets.as_integer(1.5)
+
+    with pytest.raises(ValueError):
+        widgets.as_integer(2.0 ** 64)
+
+
+def test_values_share_storage(builder):
+    widget = builder.create_widget({"type": "array", "items": {"type": "number"}}, {"ui:widget": "table"},
+                                   [1.0, 2.0])
+
+    widget.values[0] = 5.0
+    assert widget.state == [5.0, 2.0]
+
+    for i in range(100):
+        widget.add_item(float(i))
+    assert len(widget.values) == 102
+    assert widget.state[:3] == [5.0, 2.0, 0.0]
@@ -0,0 +1,74 @@
+from qt_jsonschema_form.defaults import compute_defaults
+from qt_jsonschema_form.utils import first_valid_number, iter_schema_branches, merge_schemas
+
+
+def test_merge_schemas_combines_properties():
+    base = {"type": "object", "properties": {"a": {"type": "string"}}, "required": ["a"]}
+    merged = merge_schemas(base, {"properties": {"b": {"type": "integer"}}, "required": ["a", "b"]})
+
+    assert merged["properties"] == {"a": {"type": "string"}, "b": {"type": "integer"}}
+    assert merged["required"] == ["a", "b"]
+
+
+def test_merge_schemas_const_becomes_enum():
+    merged = merge_schemas({"type": "string", "enum": ["x", "y"]}, {"const": "x"})
+
+    assert merged["enum"] == ["x"]
+    assert merged["type"] == "string"
+
+
+def test_merge_schemas_const_property_without_base_properties():
+    merged = merge_schemas({"type": "object"}, {"properties": {"kind": {"const": "x"}}})
+
+    assert merged["properties"]["kind"] == {"const": "x", "enum": ["x"], "type": "string"}
+
+
+def test_merge_schemas_const_property_only_in_base():
+    merged = merge_schemas({"properties": {"kind": {"const": 1}}}, {"properties": {"n": {"type": "integer"}}})
+
+    assert merged["properties"]["kind"]["type"] == "integer"
+
+
+def test_iter_schema_branches_one_of_tagged_union():
+    schema = {
+        "type": "object",
+        "oneOf": [
+            {"properties": {"kind": {"const": "x"}, "n": {"type": "integer"}}},
+            {"properties": {"kind": {"const": "y"}, "s": {"type": "string"}}},
+        ],
+    }
+    first, second = iter_schema_branches(schema)
+
+    assert first["type"] == "object"
+    assert first["properties"]["kind"] == {"const": "x", "enum": ["x"], "type": "string"}
+    assert second["properties"]["s"] == {"type": "string"}
+    assert compute_defaults(schema) == {"kind": "x", "n": None}
+
+
+def test_iter_schema_branches_if_then_else():
+    schema = {
+        "type": "object",
+        "if": {"properties": {"k": {"const": 1}}},
+        "then": {"properties": {"a": {"type": "string"}}},
+        "else": {"properties": {"b": {"type": "string"}}},
+    }
+    then_branch, else_branch = iter_schema_branches(schema)
+
+    assert then_branch["properties"]["k"]["type"] == "integer"
+    assert set(then_branch["properties"]) == {"k", "a"}
+    assert set(else_branch["properties"]) == {"b"}
+    assert "if" not in then_branch and "else" not in else_branch
+
+
+def test_first_valid_number():
+    assert first_valid_number({"type": "number"}) == 0.0
+    assert first_valid_number({"type": "integer", "minimum": 55, "multipleOf": 10}) == 60
+    assert first_valid_number({"type": "integer", "exclusiveMinimum": 0}) == 1
+    assert first_valid_number({"type": "integer", "minimum": 0, "exclusiveMinimum": True}) == 1
+    assert first_valid_number({"type": "number", "maximum": -5}) == -5.0
+    assert first_valid_number({"type": "number", "exclusiveMaximum": -5, "multipleOf": 2}) == -6.0
+
+    value = first_valid_number({"type": "number", "exclusiveMinimum": 1.5})
+    assert value > 1.5
+
+    assert first_valid_number({"type": "integer", "minimum": 5, "maximum": 6, "multipleOf": 10}) is None
@@ -0,0 +1,89 @@
+from qtpy import QtWidgets
+
+from qt_jsonschema_form import widgets
+
+
+def make_schema(n: int, **sub_schema) -> dict:
+    sub_schema = sub_schema or {"type": "string"}
+    names = [f"p{i}" for i in range(n)]
+    return {"type": "object", "properties": {n: dict(sub_schema) for n in names}, "required": names}
+
+
+def test_state_reports_unbuilt_rows(builder):
+    form = builder.create_form(make_schema(200), {"ui:widget": "virtual"})
+    widget = form.widget
+    form.resize(300, 300)
+    form.show()
+    QtWidgets.QApplication.processEvents()
+
+    assert 0 < len(widget.widgets) < 200
+    assert widget.state == {f"p{i}": "" for i in range(200)}
+
+
+def test_required_errors_do_not_crash(builder):
+    schema = make_schema(100)
+    schema["required"].append("missing")
+    form = builder.create_form(schema, {"ui:widget": "virtual"})
+    widget = form.widget
+    form.resize(300, 300)
+    form.show()
+    QtWidgets.QApplication.processEvents()
+
+    widget.widgets["p0"].state = "x"
+
+    assert not form.error_widget.isHidden()
+    assert widget.toolTip() == "'missing' is a required property"
+
+
+def test_held_errors_cleared_by_next_validation(builder):
+    schema = make_schema(100, type="string", minLength=1)
+    form = builder.create_form(schema, {"ui:widget": "virtual"}, {"p99": ""})
+    widget = form.widget
+    form.resize(300, 300)
+    form.show()
+    QtWidgets.QApplication.processEvents()
+
+    widget.widgets["p0"].state = "x"
+    assert "p99" in widget._pending_errors
+    assert [*form.virtual_widgets] == [widget]
+
+    widget.state = {f"p{i}": "x" for i in range(100)}
+    assert not widget._pending_errors
+
+
+def process_events():
+    # Layout requests and deferred deletions are spread over several passes of the event loop
+    for _ in range(3):
+        QtWidgets.QApplication.processEvents()
+
+
+def test_rows_are_measured_again_when_editors_grow(builder):
+    item_schema = {"type": "array", "items": {"type": "string"}}
+    form = builder.create_form(make_schema(20, **item_schema), {"ui:widget": "virtual"})
+    widget = form.widget
+    form.resize(400, 400)
+    form.show()
+    process_events()
+
+    editor = widget.widgets["p0"]
+    height = widget._row_heights[0]
+    for _ in range(5):
+        editor.add_item()
+    process_events()
+
+    assert widget._row_heights[0] == editor.sizeHint().height() > height
+    assert editor.height() == widget._row_heights[0]
+    assert widget.row_offsets[1] == widget._row_heights[0] + widget.ROW_SPACING
+
+    editor.remove_items(editor.rows[:4])
+    process_events()
+
+    assert widget._row_heights[0] == editor.height() == editor.sizeHint().height()
+
+
+def test_nested_form_widgets_are_recorded(builder):
+    schema = {"type": "object", "properties": {"inner": make_schema(3)}}
+    form = builder.create_form(schema, {"inner": {"ui:widget": "virtual"}})
+
+    assert [*form.virtual_widgets] == [form.widget.widgets["inner"]]
+    assert isinstance(form.widget.widgets["inner"], widgets.VirtualObjectSchemaWidget)